@@ -44,6 +44,9 @@ if len(USERS) > SAMPLE_SIZE:
     USERS = USERS.iloc[sample_indices].reset_index(drop=True)
     FEATS = FEATS[sample_indices]
 
+# feats.npy is stored as float16; cluster in float32
+FEATS = FEATS.astype(np.float32, copy=False)
+
 # ---------- Models ----------
 class DynamicReq(BaseModel):
     goal: str
@@ -385,6 +388,7 @@ def generate_media_preference(grp: pd.DataFrame) -> str:
     
     # Get secondary media preference
     media_counts = grp["preferred_media"].value_counts()
+    media_counts = media_counts[media_counts > 0]  # categorical counts include unseen media
     if len(media_counts) > 1:
         secondary_media = media_counts.index[1]
         return f"{top_media}, {secondary_media}"
@@ -6,14 +6,107 @@ Based on the marketing segments data dictionary
 import pandas as pd
 import numpy as np
 import sqlite3
-from sklearn.preprocessing import LabelEncoder
 import json
+import sys
 
-def create_comprehensive_dataset():
-    """Create comprehensive 10K synthetic dataset with all attributes"""
+def _categorical(values, probs):
+    """Pre-build category values and the normalised CDF that np.random.choice derives per call"""
+    cdf = np.cumsum(probs, dtype=float)
+    cdf /= cdf[-1]
+    return np.array(values), cdf
+
+def _draw(rng, categorical, size):
+    """Sample from a (values, cdf) pair with inverse-CDF lookup on a uniform draw"""
+    values, cdf = categorical
+    return values[cdf.searchsorted(rng.random(size), side="right")]
+
+# Static category values and CDFs, built once at import rather than on every call
+_GENDER = _categorical(["Male", "Female", "Other"], [0.48, 0.50, 0.02])
+_ANNUAL_HHI = _categorical(["Under ₹2L", "₹2L-₹5L", "₹5L-₹10L", "₹10L-₹20L", "₹20L-₹50L", "₹50L+"],
+                            [0.15, 0.25, 0.30, 0.20, 0.08, 0.02])
+_EDUCATION_LEVEL = _categorical(["Primary", "Secondary", "Graduate", "Postgraduate", "Doctorate"],
+                                 [0.20, 0.30, 0.35, 0.13, 0.02])
+_REGION = _categorical(["North", "South", "East", "West", "Central"],
+                        [0.25, 0.25, 0.20, 0.20, 0.10])
+_CITY_TIER = _categorical(["Tier-1", "Tier-2", "Tier-3", "Rural"], [0.30, 0.35, 0.25, 0.10])
+_MARITAL_STATUS = _categorical(["Single", "Married", "Divorced", "Widowed"], [0.35, 0.55, 0.08, 0.02])
+_NUM_ADULTS = _categorical([1, 2, 3, 4], [0.25, 0.60, 0.12, 0.03])
+_NUM_CHILDREN = _categorical([0, 1, 2, 3, 4], [0.30, 0.25, 0.25, 0.15, 0.05])
+_YOUNGEST_CHILD_AGE = _categorical(["0-2", "3-5", "6-12", "13-17", "18+"], [0.20, 0.20, 0.30, 0.20, 0.10])
+_HOME_OWNERSHIP = _categorical(["Own", "Rent", "Other"], [0.60, 0.35, 0.05])
+_DWELLING_TYPE = _categorical(["Apartment", "House", "Villa", "Other"], [0.40, 0.45, 0.10, 0.05])
+_DWELLING_SIZE = _categorical(["1BHK", "2BHK", "3BHK", "4BHK+"], [0.15, 0.35, 0.35, 0.15])
+_GROCERY_FREQUENCY = _categorical(["Daily", "Weekly", "Bi-weekly", "Monthly"], [0.15, 0.50, 0.25, 0.10])
+_ELECTRONICS_FREQUENCY = _categorical(["Never", "Rarely", "Occasionally", "Frequently"],
+                                       [0.20, 0.30, 0.35, 0.15])
+_STREAMING_SERVICES = _categorical(["Netflix", "Amazon Prime", "Disney+", "Hotstar", "None"],
+                                    [0.30, 0.25, 0.15, 0.20, 0.10])
+_TRAVEL_FREQUENCY = _categorical(["Never", "Rarely", "Occasionally", "Frequently"],
+                                  [0.10, 0.30, 0.45, 0.15])
+_TRAVEL_PREFERENCES = _categorical(["Domestic", "International", "Both"], [0.40, 0.30, 0.30])
+_FITNESS_FREQUENCY = _categorical(["Never", "Rarely", "Weekly", "Daily"], [0.20, 0.30, 0.35, 0.15])
+_INVESTMENT_TYPES = _categorical(["Stocks", "Mutual Funds", "FD", "Gold", "Real Estate", "None"],
+                                  [0.15, 0.25, 0.30, 0.15, 0.10, 0.05])
+_ALCOHOL_CONSUMPTION = _categorical(["Never", "Rarely", "Occasionally", "Frequently"],
+                                     [0.40, 0.30, 0.25, 0.05])
+_COMPANY_SIZE = _categorical(["1-10", "11-50", "51-200", "201-500", "500+"],
+                              [0.20, 0.25, 0.25, 0.20, 0.10])
+_INDUSTRY = _categorical(["IT", "Finance", "Healthcare", "Education", "Manufacturing", "Retail", "Other"],
+                          [0.20, 0.15, 0.15, 0.15, 0.15, 0.10, 0.10])
+_JOB_LEVEL = _categorical(["Entry", "Mid", "Senior", "Executive"], [0.30, 0.40, 0.25, 0.05])
+_PAYMENT_METHOD = _categorical(["UPI", "Credit Card", "Debit Card", "COD", "Wallet"],
+                                [0.45, 0.20, 0.20, 0.05, 0.10])
+_PURCHASE_FREQUENCY = _categorical(["Low", "Medium", "High"], [0.5, 0.35, 0.15])
+_DEVICE_OS = _categorical(["Android", "iOS", "Other"], [0.7, 0.28, 0.02])
+_DEVICE_RAM_GB = _categorical([2, 3, 4, 6, 8, 12], [0.05, 0.10, 0.30, 0.25, 0.20, 0.10])
+_DEVICE_STORAGE_GB = _categorical([32, 64, 128, 256, 512], [0.10, 0.30, 0.35, 0.20, 0.05])
+_LOYALTY_TIER = _categorical(["None", "Bronze", "Silver", "Gold", "Platinum"],
+                              [0.50, 0.20, 0.20, 0.08, 0.02])
+_LANGUAGE_PREF = _categorical(["English", "Hindi", "Tamil", "Telugu", "Kannada", "Bengali", "Marathi", "Gujarati", "Other"],
+                               [0.35, 0.25, 0.06, 0.06, 0.05, 0.07, 0.07, 0.05, 0.04])
+_HIGH_INCOME_TRAVEL_FREQUENCY = _categorical(["Occasionally", "Frequently"], [0.6, 0.4])
+_ZIPCODE_CLUSTERS = np.array([f"Z{z:03d}" for z in range(1, 101)])
+
+# Beta(a, b) parameters per content category, drawn together as one (8, n_users) block
+_CONTENT_CATEGORIES = ("Entertainment", "News", "Sports", "Technology", "Fashion", "Health", "Travel", "Food")
+_CONTENT_BETA_A = np.array([3, 2, 2, 2, 2, 3, 2, 3], dtype=float)
+_CONTENT_BETA_B = np.array([2, 3, 3, 3, 3, 2, 3, 2], dtype=float)
+
+# Probability of 1 for each independent 0/1 column, drawn together as one matrix
+_BINARY_COLUMNS = ("smartphone_ownership", "laptop_ownership", "tablet_ownership",
+                   "fb_usage", "ig_usage", "yt_usage", "tt_usage", "li_usage",
+                   "emi_preference", "unsubscribed")
+_BINARY_P_TRUE = np.array([0.95, 0.80, 0.40, 0.6, 0.5, 0.65, 0.3, 0.4, 0.25, 0.05], dtype=np.float32)
+
+def _clipped_normal(rng, mean, std, lo, hi, size):
+    """Draw from N(mean, std) and clip to [lo, hi] in the same buffer"""
+    out = rng.normal(mean, std, size)
+    return np.clip(out, lo, hi, out=out)
+
+def _scaled_clipped_normal(rng, scale, mean, std, lo, hi, size):
+    """Draw scale * N(mean, std) clipped to [lo, hi] without extra temporaries"""
+    out = rng.normal(mean, std, size)
+    np.multiply(scale, out, out=out)
+    return np.clip(out, lo, hi, out=out)
+
+def _conditional_normal(rng, cond, mean_true, std_true, mean_false, std_false):
+    """Draw N(mean_true, std_true) where cond holds and N(mean_false, std_false) elsewhere,
+    sampling only as many values as each branch actually uses"""
+    out = np.empty(cond.shape[0])
+    n_true = np.count_nonzero(cond)
+    out[cond] = rng.normal(mean_true, std_true, n_true)
+    out[~cond] = rng.normal(mean_false, std_false, cond.shape[0] - n_true)
+    return out
+
+def create_comprehensive_dataset(n_users=10000, seed=42):
+    """Create comprehensive 10K synthetic dataset with all attributes
+    
+    seed may be an int or a np.random.SeedSequence; to generate shards in
+    parallel, pass each worker a child of SeedSequence(seed).spawn(n) so the
+    streams are independent instead of re-seeding every worker with 42.
+    """
     
-    np.random.seed(42)
-    n_users = 10000
+    rng = np.random.default_rng(seed)
     
     print("🚀 Creating comprehensive 10K synthetic dataset...")
     
@@ -24,294 +117,233 @@ def create_comprehensive_dataset():
     print("📊 Generating Demographics...")
     
     # Age (18-75)
-    age = np.random.normal(35, 12, n_users)
-    age = np.clip(age, 18, 75).astype(int)
+    age = _clipped_normal(rng, 35, 12, 18, 75, n_users).astype(int)
     
     # Gender
-    gender = np.random.choice(["Male", "Female", "Other"], n_users, p=[0.48, 0.50, 0.02])
+    gender = _draw(rng, _GENDER, n_users)
     
     # Income (Annual Household Income)
-    income_ranges = ["Under ₹2L", "₹2L-₹5L", "₹5L-₹10L", "₹10L-₹20L", "₹20L-₹50L", "₹50L+"]
-    income_weights = [0.15, 0.25, 0.30, 0.20, 0.08, 0.02]
-    annual_hhi = np.random.choice(income_ranges, n_users, p=income_weights)
+    annual_hhi = _draw(rng, _ANNUAL_HHI, n_users)
     
     # Education
-    education_levels = ["Primary", "Secondary", "Graduate", "Postgraduate", "Doctorate"]
-    education_weights = [0.20, 0.30, 0.35, 0.13, 0.02]
-    education_level = np.random.choice(education_levels, n_users, p=education_weights)
+    education_level = _draw(rng, _EDUCATION_LEVEL, n_users)
     
     # Location
-    regions = ["North", "South", "East", "West", "Central"]
-    region_weights = [0.25, 0.25, 0.20, 0.20, 0.10]
-    region = np.random.choice(regions, n_users, p=region_weights)
+    region = _draw(rng, _REGION, n_users)
     
-    city_tiers = ["Tier-1", "Tier-2", "Tier-3", "Rural"]
-    city_tier_weights = [0.30, 0.35, 0.25, 0.10]
-    city_tier = np.random.choice(city_tiers, n_users, p=city_tier_weights)
+    city_tier = _draw(rng, _CITY_TIER, n_users)
     
     # ==================== HOUSEHOLD COMPOSITION ====================
     print("🏠 Generating Household Composition...")
     
     # Marital Status
-    marital_status = np.random.choice(["Single", "Married", "Divorced", "Widowed"], 
-                                    n_users, p=[0.35, 0.55, 0.08, 0.02])
+    marital_status = _draw(rng, _MARITAL_STATUS, n_users)
     
     # Number of Adults
-    num_adults = np.random.choice([1, 2, 3, 4], n_users, p=[0.25, 0.60, 0.12, 0.03])
+    num_adults = _draw(rng, _NUM_ADULTS, n_users)
     
     # Number of Children
-    num_children = np.random.choice([0, 1, 2, 3, 4], n_users, p=[0.30, 0.25, 0.25, 0.15, 0.05])
+    num_children = _draw(rng, _NUM_CHILDREN, n_users)
     
     # Youngest Child Age
     youngest_child_age = np.where(num_children > 0, 
-                                np.random.choice(["0-2", "3-5", "6-12", "13-17", "18+"], n_users, 
-                                               p=[0.20, 0.20, 0.30, 0.20, 0.10]), 
+                                _draw(rng, _YOUNGEST_CHILD_AGE, n_users), 
                                 "None")
     
     # Home Ownership
-    home_ownership = np.random.choice(["Own", "Rent", "Other"], n_users, p=[0.60, 0.35, 0.05])
+    home_ownership = _draw(rng, _HOME_OWNERSHIP, n_users)
     
     # Dwelling Type
-    dwelling_type = np.random.choice(["Apartment", "House", "Villa", "Other"], 
-                                   n_users, p=[0.40, 0.45, 0.10, 0.05])
+    dwelling_type = _draw(rng, _DWELLING_TYPE, n_users)
     
     # Dwelling Unit Size
-    dwelling_size = np.random.choice(["1BHK", "2BHK", "3BHK", "4BHK+"], 
-                                   n_users, p=[0.15, 0.35, 0.35, 0.15])
+    dwelling_size = _draw(rng, _DWELLING_SIZE, n_users)
     
     # ==================== COMMERCE & SHOPPING ====================
     print("🛒 Generating Commerce & Shopping Behavior...")
     
     # Grocery Shopping
-    grocery_frequency = np.random.choice(["Daily", "Weekly", "Bi-weekly", "Monthly"], 
-                                       n_users, p=[0.15, 0.50, 0.25, 0.10])
+    grocery_frequency = _draw(rng, _GROCERY_FREQUENCY, n_users)
     
-    grocery_spend = np.random.normal(8000, 3000, n_users)
-    grocery_spend = np.clip(grocery_spend, 2000, 25000)
+    grocery_spend = _clipped_normal(rng, 8000, 3000, 2000, 25000, n_users)
     
     # Electronics Shopping
-    electronics_interest = np.random.beta(2, 3, n_users)  # 0-1 score
-    electronics_frequency = np.random.choice(["Never", "Rarely", "Occasionally", "Frequently"], 
-                                           n_users, p=[0.20, 0.30, 0.35, 0.15])
+    electronics_interest = rng.beta(2, 3, n_users)  # 0-1 score
+    electronics_frequency = _draw(rng, _ELECTRONICS_FREQUENCY, n_users)
     
     # Beauty and Personal Care
-    beauty_interest = np.random.beta(3, 2, n_users)  # Higher for females
+    beauty_interest = rng.beta(3, 2, n_users)  # Higher for females
     beauty_interest = np.where(gender == "Female", beauty_interest * 1.3, beauty_interest * 0.7)
-    beauty_interest = np.clip(beauty_interest, 0, 1)
+    np.clip(beauty_interest, 0, 1, out=beauty_interest)
     
-    beauty_spend = beauty_interest * np.random.normal(2000, 1000, n_users)
-    beauty_spend = np.clip(beauty_spend, 0, 10000)
+    beauty_spend = _scaled_clipped_normal(rng, beauty_interest, 2000, 1000, 0, 10000, n_users)
     
     # Household Products
-    household_spend = np.random.normal(5000, 2000, n_users)
-    household_spend = np.clip(household_spend, 1000, 15000)
+    household_spend = _clipped_normal(rng, 5000, 2000, 1000, 15000, n_users)
     
     # Auto Shopping
-    auto_interest = np.random.beta(2, 4, n_users)
-    auto_budget = np.where(auto_interest > 0.5, 
-                          np.random.normal(500000, 200000, n_users),
-                          np.random.normal(200000, 100000, n_users))
-    auto_budget = np.clip(auto_budget, 50000, 2000000)
+    auto_interest = rng.beta(2, 4, n_users)
+    auto_budget = _conditional_normal(rng, auto_interest > 0.5, 500000, 200000, 200000, 100000)
+    np.clip(auto_budget, 50000, 2000000, out=auto_budget)
     
     # ==================== MEDIA & CONTENT INTERESTS ====================
     print("📱 Generating Media & Content Interests...")
     
     # Social Media Usage
-    social_media_usage = np.random.beta(3, 2, n_users)
+    social_media_usage = rng.beta(3, 2, n_users)
     social_platforms = ["Facebook", "Instagram", "Twitter", "LinkedIn", "TikTok", "YouTube"]
     
     # Content Preferences
-    content_preferences = {
-        "Entertainment": np.random.beta(3, 2, n_users),
-        "News": np.random.beta(2, 3, n_users),
-        "Sports": np.random.beta(2, 3, n_users),
-        "Technology": np.random.beta(2, 3, n_users),
-        "Fashion": np.random.beta(2, 3, n_users),
-        "Health": np.random.beta(3, 2, n_users),
-        "Travel": np.random.beta(2, 3, n_users),
-        "Food": np.random.beta(3, 2, n_users)
-    }
+    content_draws = rng.beta(_CONTENT_BETA_A[:, None], _CONTENT_BETA_B[:, None],
+                             size=(len(_CONTENT_CATEGORIES), n_users))
+    content_preferences = dict(zip(_CONTENT_CATEGORIES, content_draws))
     
     # Streaming Services
-    streaming_services = np.random.choice(["Netflix", "Amazon Prime", "Disney+", "Hotstar", "None"], 
-                                        n_users, p=[0.30, 0.25, 0.15, 0.20, 0.10])
+    streaming_services = _draw(rng, _STREAMING_SERVICES, n_users)
     
     # ==================== TRAVEL ====================
     print("✈️ Generating Travel Behavior...")
     
     # Travel Frequency
-    travel_frequency = np.random.choice(["Never", "Rarely", "Occasionally", "Frequently"], 
-                                      n_users, p=[0.10, 0.30, 0.45, 0.15])
+    travel_frequency = _draw(rng, _TRAVEL_FREQUENCY, n_users)
     
     # Travel Budget
-    travel_budget = np.where(travel_frequency == "Frequently", 
-                           np.random.normal(100000, 50000, n_users),
-                           np.random.normal(50000, 25000, n_users))
-    travel_budget = np.clip(travel_budget, 10000, 500000)
+    travel_budget = _conditional_normal(rng, travel_frequency == "Frequently", 100000, 50000, 50000, 25000)
+    np.clip(travel_budget, 10000, 500000, out=travel_budget)
     
     # Travel Preferences
-    travel_preferences = np.random.choice(["Domestic", "International", "Both"], 
-                                        n_users, p=[0.40, 0.30, 0.30])
+    travel_preferences = _draw(rng, _TRAVEL_PREFERENCES, n_users)
     
     # ==================== HEALTH & FITNESS ====================
     print("💪 Generating Health & Fitness...")
     
     # Fitness Interest
-    fitness_interest = np.random.beta(2, 3, n_users)
-    fitness_frequency = np.random.choice(["Never", "Rarely", "Weekly", "Daily"], 
-                                       n_users, p=[0.20, 0.30, 0.35, 0.15])
+    fitness_interest = rng.beta(2, 3, n_users)
+    fitness_frequency = _draw(rng, _FITNESS_FREQUENCY, n_users)
     
     # Health Products
-    health_product_interest = np.random.beta(3, 2, n_users)
-    health_spend = health_product_interest * np.random.normal(3000, 1500, n_users)
-    health_spend = np.clip(health_spend, 0, 15000)
+    health_product_interest = rng.beta(3, 2, n_users)
+    health_spend = _scaled_clipped_normal(rng, health_product_interest, 3000, 1500, 0, 15000, n_users)
     
     # ==================== INVESTMENTS & FINANCE ====================
     print("💰 Generating Investment & Finance...")
     
     # Investment Interest
-    investment_interest = np.random.beta(2, 3, n_users)
-    investment_amount = np.where(investment_interest > 0.5, 
-                               np.random.normal(100000, 50000, n_users),
-                               np.random.normal(25000, 15000, n_users))
-    investment_amount = np.clip(investment_amount, 5000, 1000000)
+    investment_interest = rng.beta(2, 3, n_users)
+    investment_amount = _conditional_normal(rng, investment_interest > 0.5, 100000, 50000, 25000, 15000)
+    np.clip(investment_amount, 5000, 1000000, out=investment_amount)
     
     # Investment Types
-    investment_types = np.random.choice(["Stocks", "Mutual Funds", "FD", "Gold", "Real Estate", "None"], 
-                                      n_users, p=[0.15, 0.25, 0.30, 0.15, 0.10, 0.05])
+    investment_types = _draw(rng, _INVESTMENT_TYPES, n_users)
     
     # ==================== ALCOHOL & LIFESTYLE ====================
     print("🍷 Generating Alcohol & Lifestyle...")
     
     # Alcohol Consumption
-    alcohol_consumption = np.random.choice(["Never", "Rarely", "Occasionally", "Frequently"], 
-                                         n_users, p=[0.40, 0.30, 0.25, 0.05])
+    alcohol_consumption = _draw(rng, _ALCOHOL_CONSUMPTION, n_users)
     
-    alcohol_spend = np.where(alcohol_consumption == "Frequently", 
-                           np.random.normal(5000, 2000, n_users),
-                           np.random.normal(2000, 1000, n_users))
-    alcohol_spend = np.clip(alcohol_spend, 0, 15000)
+    alcohol_spend = _conditional_normal(rng, alcohol_consumption == "Frequently", 5000, 2000, 2000, 1000)
+    np.clip(alcohol_spend, 0, 15000, out=alcohol_spend)
     
     # ==================== BUSINESS & PROFESSIONAL ====================
     print("💼 Generating Business & Professional...")
     
     # Company Size (for employed users)
-    company_size = np.random.choice(["1-10", "11-50", "51-200", "201-500", "500+"], 
-                                  n_users, p=[0.20, 0.25, 0.25, 0.20, 0.10])
+    company_size = _draw(rng, _COMPANY_SIZE, n_users)
     
     # Industry
-    industries = ["IT", "Finance", "Healthcare", "Education", "Manufacturing", "Retail", "Other"]
-    industry_weights = [0.20, 0.15, 0.15, 0.15, 0.15, 0.10, 0.10]
-    industry = np.random.choice(industries, n_users, p=industry_weights)
+    industry = _draw(rng, _INDUSTRY, n_users)
     
     # Job Level
-    job_level = np.random.choice(["Entry", "Mid", "Senior", "Executive"], 
-                               n_users, p=[0.30, 0.40, 0.25, 0.05])
+    job_level = _draw(rng, _JOB_LEVEL, n_users)
     
     # ==================== DEVICE & TECHNOLOGY ====================
     print("📱 Generating Device & Technology...")
     
-    # Device Ownership
-    smartphone_ownership = np.random.choice([0, 1], n_users, p=[0.05, 0.95])
-    laptop_ownership = np.random.choice([0, 1], n_users, p=[0.20, 0.80])
-    tablet_ownership = np.random.choice([0, 1], n_users, p=[0.60, 0.40])
+    # Device Ownership, platform usage, EMI and unsubscribe flags: one Bernoulli matrix
+    binary_flags = (rng.random((n_users, len(_BINARY_COLUMNS)), dtype=np.float32) < _BINARY_P_TRUE).astype(np.uint8)
+    (smartphone_ownership, laptop_ownership, tablet_ownership,
+     fb_usage, ig_usage, yt_usage, tt_usage, li_usage,
+     emi_preference, unsubscribed) = binary_flags.T
     
     # Technology Adoption
-    tech_adoption_score = np.random.beta(3, 2, n_users)
+    tech_adoption_score = rng.beta(3, 2, n_users)
     
     # ==================== PSYCHOGRAPHICS ====================
     print("🧠 Generating Psychographics...")
     
     # Personality Traits (Big 5)
-    openness = np.random.normal(0.5, 0.2, n_users)
-    conscientiousness = np.random.normal(0.5, 0.2, n_users)
-    extraversion = np.random.normal(0.5, 0.2, n_users)
-    agreeableness = np.random.normal(0.5, 0.2, n_users)
-    neuroticism = np.random.normal(0.5, 0.2, n_users)
-    
-    # Clip to 0-1 range
-    openness = np.clip(openness, 0, 1)
-    conscientiousness = np.clip(conscientiousness, 0, 1)
-    extraversion = np.clip(extraversion, 0, 1)
-    agreeableness = np.clip(agreeableness, 0, 1)
-    neuroticism = np.clip(neuroticism, 0, 1)
+    openness = _clipped_normal(rng, 0.5, 0.2, 0, 1, n_users)
+    conscientiousness = _clipped_normal(rng, 0.5, 0.2, 0, 1, n_users)
+    extraversion = _clipped_normal(rng, 0.5, 0.2, 0, 1, n_users)
+    agreeableness = _clipped_normal(rng, 0.5, 0.2, 0, 1, n_users)
+    neuroticism = _clipped_normal(rng, 0.5, 0.2, 0, 1, n_users)
     
     # Values
-    environmental_consciousness = np.random.beta(3, 2, n_users)
-    social_responsibility = np.random.beta(2, 3, n_users)
-    innovation_preference = np.random.beta(2, 3, n_users)
+    environmental_consciousness = rng.beta(3, 2, n_users)
+    social_responsibility = rng.beta(2, 3, n_users)
+    innovation_preference = rng.beta(2, 3, n_users)
     
     # ==================== ADDITIONAL MARKETING SIGNALS ====================
     print("📈 Generating Additional Marketing Signals...")
     
-    # Social platform usage (binary)
-    fb_usage = np.random.choice([0, 1], n_users, p=[0.4, 0.6])
-    ig_usage = np.random.choice([0, 1], n_users, p=[0.5, 0.5])
-    yt_usage = np.random.choice([0, 1], n_users, p=[0.35, 0.65])
-    tt_usage = np.random.choice([0, 1], n_users, p=[0.7, 0.3])
-    li_usage = np.random.choice([0, 1], n_users, p=[0.6, 0.4])
-    
     # Ad engagement metrics (0-1)
-    ctr_score = np.random.beta(2, 5, n_users)
-    vtr_score = np.random.beta(3, 4, n_users)
-    dwell_time_score = np.random.beta(3, 3, n_users)
+    ctr_score = rng.beta(2, 5, n_users)
+    vtr_score = rng.beta(3, 4, n_users)
+    dwell_time_score = rng.beta(3, 3, n_users)
     
     # Payment preferences
-    payment_method = np.random.choice(["UPI", "Credit Card", "Debit Card", "COD", "Wallet"], n_users, p=[0.45, 0.20, 0.20, 0.05, 0.10])
-    emi_preference = np.random.choice([0, 1], n_users, p=[0.75, 0.25])
+    payment_method = _draw(rng, _PAYMENT_METHOD, n_users)
     
     # E-commerce behavior
-    cart_abandon_rate = np.random.beta(3, 3, n_users)
-    purchase_frequency = np.random.choice(["Low", "Medium", "High"], n_users, p=[0.5, 0.35, 0.15])
-    avg_order_value = np.random.normal(2500, 1200, n_users)
-    avg_order_value = np.clip(avg_order_value, 200, 15000)
+    cart_abandon_rate = rng.beta(3, 3, n_users)
+    purchase_frequency = _draw(rng, _PURCHASE_FREQUENCY, n_users)
+    avg_order_value = _clipped_normal(rng, 2500, 1200, 200, 15000, n_users)
     
     # App category usage (0-1)
-    gaming_app_use = np.random.beta(2, 4, n_users)
-    finance_app_use = np.random.beta(2, 3, n_users)
-    shopping_app_use = np.random.beta(3, 2, n_users)
-    food_delivery_use = np.random.beta(3, 2, n_users)
-    ride_hailing_use = np.random.beta(2, 3, n_users)
+    gaming_app_use = rng.beta(2, 4, n_users)
+    finance_app_use = rng.beta(2, 3, n_users)
+    shopping_app_use = rng.beta(3, 2, n_users)
+    food_delivery_use = rng.beta(3, 2, n_users)
+    ride_hailing_use = rng.beta(2, 3, n_users)
     
     # Device specs
-    device_os = np.random.choice(["Android", "iOS", "Other"], n_users, p=[0.7, 0.28, 0.02])
-    device_ram_gb = np.random.choice([2, 3, 4, 6, 8, 12], n_users, p=[0.05, 0.10, 0.30, 0.25, 0.20, 0.10])
-    device_storage_gb = np.random.choice([32, 64, 128, 256, 512], n_users, p=[0.10, 0.30, 0.35, 0.20, 0.05])
+    device_os = _draw(rng, _DEVICE_OS, n_users)
+    device_ram_gb = _draw(rng, _DEVICE_RAM_GB, n_users)
+    device_storage_gb = _draw(rng, _DEVICE_STORAGE_GB, n_users)
     
     # Time-of-day and weekend activity
-    active_morning = np.random.beta(2, 3, n_users)
-    active_evening = np.random.beta(3, 2, n_users)
-    weekend_activity = np.random.beta(2, 3, n_users)
+    active_morning = rng.beta(2, 3, n_users)
+    active_evening = rng.beta(3, 2, n_users)
+    weekend_activity = rng.beta(2, 3, n_users)
     
     # Email engagement
-    email_open_rate = np.random.beta(2, 4, n_users)
-    email_click_rate = np.random.beta(2, 6, n_users)
-    unsubscribed = np.random.choice([0, 1], n_users, p=[0.95, 0.05])
+    email_open_rate = rng.beta(2, 4, n_users)
+    email_click_rate = rng.beta(2, 6, n_users)
     
     # Loyalty and coupons
-    loyalty_tier = np.random.choice(["None", "Bronze", "Silver", "Gold", "Platinum"], n_users, p=[0.50, 0.20, 0.20, 0.08, 0.02])
-    coupon_usage_rate = np.random.beta(2, 3, n_users)
-    referral_tendency = np.random.beta(2, 3, n_users)
+    loyalty_tier = _draw(rng, _LOYALTY_TIER, n_users)
+    coupon_usage_rate = rng.beta(2, 3, n_users)
+    referral_tendency = rng.beta(2, 3, n_users)
     
     # Satisfaction and NPS
-    csat_score = np.random.beta(4, 2, n_users)
-    nps_score = np.random.normal(0.2, 0.2, n_users)
-    nps_score = np.clip(nps_score, 0, 1)
+    csat_score = rng.beta(4, 2, n_users)
+    nps_score = _clipped_normal(rng, 0.2, 0.2, 0, 1, n_users)
     
     # Churn and propensity
-    churn_risk = np.random.beta(2, 3, n_users)
-    propensity_to_buy = np.random.beta(3, 2, n_users)
+    churn_risk = rng.beta(2, 3, n_users)
+    propensity_to_buy = rng.beta(3, 2, n_users)
     
     # Languages and geo granularity
-    language_pref = np.random.choice(["English", "Hindi", "Tamil", "Telugu", "Kannada", "Bengali", "Marathi", "Gujarati", "Other"], n_users, p=[0.35, 0.25, 0.06, 0.06, 0.05, 0.07, 0.07, 0.05, 0.04])
-    zipcode_cluster = np.random.choice([f"Z{z:03d}" for z in range(1, 101)], n_users)
+    language_pref = _draw(rng, _LANGUAGE_PREF, n_users)
+    zipcode_cluster = rng.choice(_ZIPCODE_CLUSTERS, n_users)
     
     # Brand affinities (0-1)
-    brand_bose_affinity = np.random.beta(2, 3, n_users)
-    brand_apple_affinity = np.random.beta(2, 3, n_users)
-    brand_samsung_affinity = np.random.beta(2, 3, n_users)
-    brand_nike_affinity = np.random.beta(2, 3, n_users)
-    brand_amazon_affinity = np.random.beta(3, 2, n_users)
+    brand_bose_affinity = rng.beta(2, 3, n_users)
+    brand_apple_affinity = rng.beta(2, 3, n_users)
+    brand_samsung_affinity = rng.beta(2, 3, n_users)
+    brand_nike_affinity = rng.beta(2, 3, n_users)
+    brand_amazon_affinity = rng.beta(3, 2, n_users)
     
     # ==================== CREATE DATAFRAME ====================
     print("📊 Creating comprehensive DataFrame...")
@@ -453,8 +485,8 @@ def create_comprehensive_dataset():
     
     # Income correlations
     high_income_mask = df["annual_hhi"].isin(["₹10L-₹20L", "₹20L-₹50L", "₹50L+"])
-    df.loc[high_income_mask, "travel_frequency"] = np.random.choice(["Occasionally", "Frequently"], 
-                                                                  len(df[high_income_mask]), p=[0.6, 0.4])
+    df.loc[high_income_mask, "travel_frequency"] = _draw(rng, _HIGH_INCOME_TRAVEL_FREQUENCY,
+                                                         int(high_income_mask.sum()))
     df.loc[high_income_mask, "investment_interest"] *= 1.4
     
     # Gender correlations
@@ -478,6 +510,20 @@ def create_comprehensive_dataset():
     
     return df
 
+# Generation metadata for the data dictionary
+_FEATURE_CATEGORIES = {
+    "demographics": ["age", "gender", "annual_hhi", "education_level", "region", "city_tier"],
+    "household": ["marital_status", "num_adults", "num_children", "youngest_child_age", "home_ownership", "dwelling_type", "dwelling_size"],
+    "commerce": ["grocery_frequency", "grocery_spend", "electronics_interest", "beauty_interest", "beauty_spend", "household_spend", "auto_interest", "auto_budget"],
+    "media": ["social_media_usage", "streaming_services", "entertainment_interest", "news_interest", "sports_interest", "technology_interest", "fashion_interest", "health_interest", "travel_interest", "food_interest"],
+    "lifestyle": ["travel_frequency", "travel_budget", "travel_preferences", "fitness_interest", "fitness_frequency", "health_product_interest", "health_spend"],
+    "finance": ["investment_interest", "investment_amount", "investment_types"],
+    "consumption": ["alcohol_consumption", "alcohol_spend"],
+    "professional": ["company_size", "industry", "job_level"],
+    "technology": ["smartphone_ownership", "laptop_ownership", "tablet_ownership", "tech_adoption_score"],
+    "psychographics": ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism", "environmental_consciousness", "social_responsibility", "innovation_preference"]
+}
+
 def save_comprehensive_dataset(df, db_path="data/comprehensive_users.db", csv_path="data/comprehensive_users.csv"):
     """Save comprehensive dataset to multiple formats"""
     
@@ -499,18 +545,7 @@ def save_comprehensive_dataset(df, db_path="data/comprehensive_users.db", csv_pa
             "total_features": len(df.columns),
             "created_date": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
         },
-        "feature_categories": {
-            "demographics": ["age", "gender", "annual_hhi", "education_level", "region", "city_tier"],
-            "household": ["marital_status", "num_adults", "num_children", "youngest_child_age", "home_ownership", "dwelling_type", "dwelling_size"],
-            "commerce": ["grocery_frequency", "grocery_spend", "electronics_interest", "beauty_interest", "beauty_spend", "household_spend", "auto_interest", "auto_budget"],
-            "media": ["social_media_usage", "streaming_services", "entertainment_interest", "news_interest", "sports_interest", "technology_interest", "fashion_interest", "health_interest", "travel_interest", "food_interest"],
-            "lifestyle": ["travel_frequency", "travel_budget", "travel_preferences", "fitness_interest", "fitness_frequency", "health_product_interest", "health_spend"],
-            "finance": ["investment_interest", "investment_amount", "investment_types"],
-            "consumption": ["alcohol_consumption", "alcohol_spend"],
-            "professional": ["company_size", "industry", "job_level"],
-            "technology": ["smartphone_ownership", "laptop_ownership", "tablet_ownership", "tech_adoption_score"],
-            "psychographics": ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism", "environmental_consciousness", "social_responsibility", "innovation_preference"]
-        }
+        "feature_categories": _FEATURE_CATEGORIES
     }
     
     with open("data/data_dictionary.json", "w") as f:
@@ -526,6 +561,8 @@ def save_comprehensive_dataset(df, db_path="data/comprehensive_users.db", csv_pa
     return data_dict
 
 if __name__ == "__main__":
+    verbose = "--verbose" in sys.argv[1:]
+    
     # Create comprehensive dataset
     print("🚀 Creating comprehensive 10K synthetic dataset...")
     df = create_comprehensive_dataset()
@@ -537,8 +574,10 @@ if __name__ == "__main__":
     print("\n📋 Sample data:")
     print(df.head())
     
-    print("\n📈 Dataset statistics:")
-    print(df.describe())
+    # describe() is a full quantile pass over every numeric column; only on request
+    if verbose:
+        print("\n📈 Dataset statistics:")
+        print(df.describe())
     
     print("\n🎯 Feature distribution:")
     for category, features in data_dict["feature_categories"].items():
@@ -5,16 +5,152 @@ Works with all ID Graph attributes and marketing segments
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+import ast
+import copy
 import json
-from sklearn.cluster import KMeans
+import os
+import re
+import string
+from functools import lru_cache
+from sklearn.cluster import DBSCAN, HDBSCAN, KMeans, MiniBatchKMeans
+from sklearn.mixture import GaussianMixture
 from sklearn.metrics import silhouette_score
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from llm_agent import generate_text, is_llm_enabled
 
-@dataclass
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    _json_loads = json.loads
+
+try:
+    import connectorx as cx
+except ImportError:  # connectorx is optional; sqlite3 + read_sql_query is the fallback
+    cx = None
+
+# Columns of the users table the agents actually read, in table order
+USER_COLUMNS = (
+    "user_id", "age", "gender", "annual_hhi", "education_level", "city_tier",
+    "marital_status", "num_children", "grocery_frequency", "grocery_spend",
+    "electronics_interest", "beauty_interest", "beauty_spend", "household_spend",
+    "auto_interest", "social_media_usage", "streaming_services",
+    "entertainment_interest", "news_interest", "technology_interest",
+    "health_interest", "travel_frequency", "fitness_interest", "fitness_frequency",
+    "health_product_interest", "health_spend", "investment_interest",
+    "tech_adoption_score", "openness", "conscientiousness", "extraversion",
+    "agreeableness", "environmental_consciousness", "social_responsibility",
+    "innovation_preference", "fb_usage", "ig_usage", "yt_usage", "tt_usage",
+    "cart_abandon_rate", "avg_order_value", "shopping_app_use", "email_open_rate",
+    "email_click_rate", "loyalty_tier", "coupon_usage_rate", "referral_tendency",
+    "churn_risk", "propensity_to_buy", "brand_bose_affinity", "brand_apple_affinity",
+    "brand_samsung_affinity", "brand_nike_affinity", "brand_amazon_affinity",
+)
+
+# Ordinal weights used by the feature engineer
+_TRAVEL_MAP = {"Never": 0, "Rarely": 1, "Occasionally": 2, "Frequently": 3}
+_FITNESS_MAP = {"Never": 0, "Rarely": 1, "Weekly": 2, "Daily": 3}
+_CITY_TIER_MAP = {"Tier-1": 1, "Tier-2": 0.7, "Tier-3": 0.4, "Rural": 0.1}
+_EDU_MAP = {"Primary": 0.2, "Secondary": 0.4, "Graduate": 0.7, "Postgraduate": 0.9, "Doctorate": 1.0}
+_LOYALTY_TIER_MAP = {"None": 0.0, "Bronze": 0.25, "Silver": 0.5, "Gold": 0.75, "Platinum": 1.0}
+
+# Low-cardinality text columns filtered, mapped, grouped or mode-aggregated by the agents
+CATEGORICAL_COLUMNS = (
+    "gender", "annual_hhi", "education_level", "city_tier", "marital_status",
+    "grocery_frequency", "streaming_services", "travel_frequency", "fitness_frequency",
+    "loyalty_tier",
+)
+
+# Optional numeric signals the feature engineer reads; absent ones default to 0
+OPTIONAL_NUMERIC_COLUMNS = (
+    "shopping_app_use", "cart_abandon_rate", "propensity_to_buy", "email_open_rate",
+    "email_click_rate", "fb_usage", "ig_usage", "yt_usage", "tt_usage", "coupon_usage_rate",
+    "referral_tendency", "churn_risk", "brand_bose_affinity", "brand_apple_affinity",
+    "brand_samsung_affinity", "brand_nike_affinity", "brand_amazon_affinity",
+)
+
+# Level order (low to high) for the ordinal ones
+ORDINAL_LEVELS = {
+    "travel_frequency": list(_TRAVEL_MAP),
+    "city_tier": sorted(_CITY_TIER_MAP, key=_CITY_TIER_MAP.get),
+    "education_level": list(_EDU_MAP),
+    "loyalty_tier": list(_LOYALTY_TIER_MAP),
+}
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def _lower_goal(goal: str) -> str:
+    """Lowercase a goal, using a plain ASCII table unless it has Unicode text"""
+    return goal.translate(_ASCII_LOWER) if goal.isascii() else goal.lower()
+
+@lru_cache(maxsize=1)
+def _load_data_dictionary_file(path: str = "data/data_dictionary.json") -> Dict:
+    """Read the data dictionary once per process"""
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+def _weighted_sums(df: pd.DataFrame, scores: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """Weighted-sum scores from one float32 matrix product; missing columns count as 0"""
+    cols = [col for col in dict.fromkeys(c for weights in scores.values() for c in weights) if col in df.columns]
+    W = np.array([[weights.get(col, 0.0) for weights in scores.values()] for col in cols], dtype=np.float32)
+    return pd.DataFrame(df[cols].to_numpy(dtype=np.float32) @ W, index=df.index, columns=list(scores))
+
+def _ensure_numeric(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Add missing columns as float32 zeros and coerce non-numeric ones to float32"""
+    for col in columns:
+        if col not in df.columns:
+            df[col] = np.float32(0.0)
+        elif not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(np.float32)
+    return df
+
+def _parse_llm_json(text: str) -> Optional[Dict]:
+    """Parse an LLM JSON object response, or None if it is not one"""
+    text = text.strip()
+    if not text.startswith("{"):
+        return None
+    try:
+        data = _json_loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def _partition_quantile(values: np.ndarray, q: float) -> float:
+    """Linear-interpolated quantile (as Series.quantile) via O(n) partitioning"""
+    values = values[~np.isnan(values)].astype(np.float64)
+    pos = q * (len(values) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    part = np.partition(values, [lo, hi])
+    return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+
+_FORMULA_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd
+)
+
+def _is_safe_formula(formula: str, columns) -> bool:
+    """Accept only arithmetic over known column names and numeric constants"""
+    try:
+        tree = ast.parse(formula, mode="eval")
+    except SyntaxError:
+        return False
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_NODES):
+            return False
+        if isinstance(node, ast.Name) and node.id not in columns:
+            return False
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            return False
+    return True
+
+@dataclass(frozen=True, slots=True)
 class EnhancedGoalAnalysis:
     """Enhanced goal analysis with comprehensive attributes"""
     original_goal: str
@@ -44,17 +180,31 @@ class EnhancedMultiAgentSystem:
             "strategy_generator": EnhancedStrategyGeneratorAgent()
         }
     
-    def _load_users_data(self) -> pd.DataFrame:
-        """Load comprehensive users data"""
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query("SELECT * FROM users", conn)
-        conn.close()
+    def _load_users_data(self, columns=USER_COLUMNS) -> pd.DataFrame:
+        """Load the referenced user columns with numerics downcast"""
+        query = f"SELECT {', '.join(columns)} FROM users"
+        if cx is not None:
+            df = cx.read_sql(f"sqlite://{os.path.abspath(self.db_path)}", query, return_type="arrow").to_pandas()
+        else:
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                # Memory-map the file and keep the page cache/temp tables in RAM for the bulk read
+                conn.execute("PRAGMA mmap_size=268435456")
+                conn.execute("PRAGMA cache_size=-200000")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                df = pd.read_sql_query(query, conn)
+        
+        for col in df.select_dtypes(include="integer").columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        for col in df.select_dtypes(include="floating").columns:
+            df[col] = pd.to_numeric(df[col], downcast="float")
+        for col in CATEGORICAL_COLUMNS:
+            levels = ORDINAL_LEVELS.get(col)
+            df[col] = pd.Categorical(df[col], categories=levels, ordered=levels is not None)
         return df
     
     def _load_data_dictionary(self) -> Dict:
         """Load data dictionary"""
-        with open("data/data_dictionary.json", "r") as f:
-            return json.load(f)
+        return _load_data_dictionary_file()
     
     def generate_enhanced_audiences(self, marketing_goal: str) -> Dict[str, Any]:
         """Generate enhanced audiences using comprehensive multi-agent pipeline"""
@@ -103,12 +253,27 @@ class EnhancedMultiAgentSystem:
             "pipeline_success": True
         }
 
+_SYSTEM_SINGLETON: Optional[EnhancedMultiAgentSystem] = None
+_SYSTEM_LOCK = threading.Lock()
+
+def get_system() -> EnhancedMultiAgentSystem:
+    """Process-wide system so the user data and agents are loaded once and shared"""
+    global _SYSTEM_SINGLETON
+    if _SYSTEM_SINGLETON is None:
+        with _SYSTEM_LOCK:
+            if _SYSTEM_SINGLETON is None:
+                _SYSTEM_SINGLETON = EnhancedMultiAgentSystem()
+    return _SYSTEM_SINGLETON
+
 class EnhancedGoalAnalyzerAgent:
     """Agent 1: Enhanced goal analysis with comprehensive attribute understanding"""
     
     def __init__(self, data_dictionary: Dict):
         self.data_dictionary = data_dictionary
         self._build_comprehensive_knowledge_base()
+        
+        # Rule-based analysis is pure in the goal text; cache per agent so repeated goals skip the scan
+        self._analyze_goal_with_rules = lru_cache(maxsize=1024)(self._analyze_goal_with_rules)
     
     def _build_comprehensive_knowledge_base(self):
         """Build comprehensive knowledge base"""
@@ -160,11 +325,61 @@ class EnhancedGoalAnalyzerAgent:
             "premium_buyers": ["premium", "luxury", "high-end", "quality"],
             "online_shoppers": ["online", "digital", "ecommerce", "internet"]
         }
+        
+        # Media, lifestyle and intent keywords
+        self.media_keywords = ["social", "video", "streaming", "content", "entertainment", "news"]
+        self.lifestyle_keywords = ["luxury", "premium", "budget", "family", "single", "professional"]
+        self.intent_patterns = {
+            "reach": ["reach", "awareness", "visibility"],
+            "engagement": ["engagement", "interaction", "social"],
+            "conversion": ["conversion", "sales", "purchase"],
+            "retention": ["retention", "loyalty", "repeat"]
+        }
+        
+        self._build_keyword_matcher()
+    
+    def _build_keyword_matcher(self):
+        """Compile every keyword into one pattern tagged with (category, subkey)"""
+        groups = {("psychographic", key): kws for key, kws in self.psychographic_patterns.items()}
+        for category, patterns in self.demographic_patterns.items():
+            groups.update({(category, key): kws for key, kws in patterns.items()})
+        groups.update({("behavioral", key): kws for key, kws in self.behavioral_patterns.items()})
+        groups.update({("commerce", key): kws for key, kws in self.commerce_patterns.items()})
+        groups.update({("media", kw): [kw] for kw in self.media_keywords})
+        groups.update({("lifestyle", kw): [kw] for kw in self.lifestyle_keywords})
+        groups.update({("intent", key): kws for key, kws in self.intent_patterns.items()})
+        
+        # Declaration order decides between competing single-valued tags (e.g. two age groups)
+        self._tag_rank = {tag: rank for rank, tag in enumerate(groups)}
+        
+        self._keyword_tags = {}
+        for tag, keywords in groups.items():
+            for keyword in keywords:
+                self._keyword_tags.setdefault(keyword, set()).add(tag)
+        
+        # The lookahead reports the longest keyword starting at each offset;
+        # shorter keywords sharing that start are recovered via their prefixes
+        keywords = sorted(self._keyword_tags, key=len, reverse=True)
+        self._keyword_prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        self._keyword_pattern = re.compile(
+            "(?=(" + "|".join(map(re.escape, keywords)) + "))"
+        )
+    
+    def _match_keywords(self, goal: str) -> set:
+        """Return the (category, subkey) tags of every keyword occurring in the goal"""
+        tags = set()
+        for longest in set(self._keyword_pattern.findall(goal)):
+            for keyword in self._keyword_prefixes[longest]:
+                tags |= self._keyword_tags[keyword]
+        return tags
     
     def analyze_enhanced_goal(self, goal: str) -> EnhancedGoalAnalysis:
         """Analyze goal with comprehensive understanding"""
         
-        goal_lower = goal.lower()
+        goal_lower = _lower_goal(goal)
 
         # Try LLM-assisted analysis first
         if is_llm_enabled():
@@ -172,8 +387,9 @@ class EnhancedGoalAnalyzerAgent:
             if llm_analysis:
                 return llm_analysis
         
-        # Fallback to rule-based analysis
-        return self._analyze_goal_with_rules(goal_lower)
+        # Fallback to rule-based analysis; the result is cached, so hand out a copy whose
+        # dict/list fields callers can't use to mutate later cache hits
+        return copy.deepcopy(self._analyze_goal_with_rules(goal_lower))
     
     def _analyze_goal_with_llm(self, goal: str) -> Optional[EnhancedGoalAnalysis]:
         """Analyze goal using LLM with structured output"""
@@ -216,11 +432,13 @@ Only include fields that are clearly present in the goal. Use null for missing f
         if not llm_response:
             return None
         
+        # Parse JSON response
+        data = _parse_llm_json(llm_response)
+        if data is None:
+            print("LLM parsing error: response is not a JSON object")
+            return None
+        
         try:
-            # Parse JSON response
-            import json
-            data = json.loads(llm_response.strip())
-            
             # Convert to EnhancedGoalAnalysis format
             demographics = data.get("demographics", {})
             behavioral_focus = data.get("behavioral_focus", ["shopping"])
@@ -243,33 +461,36 @@ Only include fields that are clearly present in the goal. Use null for missing f
                 confidence=confidence
             )
             
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (KeyError, TypeError) as e:
             print(f"LLM parsing error: {e}")
             return None
     
     def _analyze_goal_with_rules(self, goal_lower: str) -> EnhancedGoalAnalysis:
         """Fallback rule-based analysis"""
         
+        # Single scan of the goal for every keyword category
+        tags = self._match_keywords(goal_lower)
+        
         # Analyze demographics
-        target_demographics = self._analyze_demographics(goal_lower)
+        target_demographics = self._analyze_demographics(tags)
         
         # Analyze behavioral focus
-        behavioral_focus = self._analyze_behavioral_focus(goal_lower)
+        behavioral_focus = self._analyze_behavioral_focus(tags)
         
         # Analyze psychographic profile
-        psychographic_profile = self._analyze_psychographics(goal_lower)
+        psychographic_profile = self._analyze_psychographics(tags)
         
         # Analyze commerce patterns
-        commerce_patterns = self._analyze_commerce_patterns(goal_lower)
+        commerce_patterns = self._analyze_commerce_patterns(tags)
         
         # Analyze media preferences
-        media_preferences = self._analyze_media_preferences(goal_lower)
+        media_preferences = self._analyze_media_preferences(tags)
         
         # Analyze lifestyle segments
-        lifestyle_segments = self._analyze_lifestyle_segments(goal_lower)
+        lifestyle_segments = self._analyze_lifestyle_segments(tags)
         
         # Determine intent
-        intent = self._determine_enhanced_intent(goal_lower)
+        intent = self._determine_enhanced_intent(tags)
         
         # Calculate confidence
         confidence = self._calculate_enhanced_confidence(
@@ -288,84 +509,46 @@ Only include fields that are clearly present in the goal. Use null for missing f
             confidence=confidence
         )
     
-    def _analyze_demographics(self, goal: str) -> Dict[str, Any]:
+    def _analyze_demographics(self, tags: set) -> Dict[str, Any]:
         """Analyze demographic targeting"""
         demographics = {}
         
-        # Age analysis
-        for age_group, keywords in self.demographic_patterns["age_groups"].items():
-            if any(keyword in goal for keyword in keywords):
-                demographics["age_group"] = age_group
-                break
-        
-        # Income analysis
-        for income_level, keywords in self.demographic_patterns["income_levels"].items():
-            if any(keyword in goal for keyword in keywords):
-                demographics["income_level"] = income_level
-                break
-        
-        # Education analysis
-        for education_level, keywords in self.demographic_patterns["education"].items():
-            if any(keyword in goal for keyword in keywords):
-                demographics["education_level"] = education_level
-                break
+        # Age, income and education are single-valued: keep the first-declared hit per category
+        for category, field in (("age_groups", "age_group"), ("income_levels", "income_level"),
+                                ("education", "education_level")):
+            hits = [tag for tag in tags if tag[0] == category]
+            if hits:
+                demographics[field] = min(hits, key=self._tag_rank.__getitem__)[1]
         
         return demographics
     
-    def _analyze_behavioral_focus(self, goal: str) -> List[str]:
+    def _analyze_behavioral_focus(self, tags: set) -> List[str]:
         """Analyze behavioral focus areas"""
-        focus_areas = []
-        for behavior, keywords in self.behavioral_patterns.items():
-            if any(keyword in goal for keyword in keywords):
-                focus_areas.append(behavior)
+        focus_areas = [b for b in self.behavioral_patterns if ("behavioral", b) in tags]
         return focus_areas if focus_areas else ["shopping"]
     
-    def _analyze_psychographics(self, goal: str) -> Dict[str, Any]:
+    def _analyze_psychographics(self, tags: set) -> Dict[str, Any]:
         """Analyze psychographic profile"""
-        psychographics = {}
-        for profile_type, keywords in self.psychographic_patterns.items():
-            if any(keyword in goal for keyword in keywords):
-                psychographics[profile_type] = True
-        return psychographics
+        return {p: True for p in self.psychographic_patterns if ("psychographic", p) in tags}
     
-    def _analyze_commerce_patterns(self, goal: str) -> List[str]:
+    def _analyze_commerce_patterns(self, tags: set) -> List[str]:
         """Analyze commerce patterns"""
-        patterns = []
-        for pattern_type, keywords in self.commerce_patterns.items():
-            if any(keyword in goal for keyword in keywords):
-                patterns.append(pattern_type)
-        return patterns
+        return [p for p in self.commerce_patterns if ("commerce", p) in tags]
     
-    def _analyze_media_preferences(self, goal: str) -> List[str]:
+    def _analyze_media_preferences(self, tags: set) -> List[str]:
         """Analyze media preferences"""
-        preferences = []
-        media_keywords = ["social", "video", "streaming", "content", "entertainment", "news"]
-        for keyword in media_keywords:
-            if keyword in goal:
-                preferences.append(keyword)
-        return preferences
+        return [kw for kw in self.media_keywords if ("media", kw) in tags]
     
-    def _analyze_lifestyle_segments(self, goal: str) -> List[str]:
+    def _analyze_lifestyle_segments(self, tags: set) -> List[str]:
         """Analyze lifestyle segments"""
-        segments = []
-        lifestyle_keywords = ["luxury", "premium", "budget", "family", "single", "professional"]
-        for keyword in lifestyle_keywords:
-            if keyword in goal:
-                segments.append(keyword)
-        return segments
+        return [kw for kw in self.lifestyle_keywords if ("lifestyle", kw) in tags]
     
-    def _determine_enhanced_intent(self, goal: str) -> str:
+    def _determine_enhanced_intent(self, tags: set) -> str:
         """Determine enhanced intent"""
-        if any(word in goal for word in ["reach", "awareness", "visibility"]):
-            return "reach"
-        elif any(word in goal for word in ["engagement", "interaction", "social"]):
-            return "engagement"
-        elif any(word in goal for word in ["conversion", "sales", "purchase"]):
-            return "conversion"
-        elif any(word in goal for word in ["retention", "loyalty", "repeat"]):
-            return "retention"
-        else:
-            return "reach"
+        for intent in self.intent_patterns:
+            if ("intent", intent) in tags:
+                return intent
+        return "reach"
     
     def _calculate_enhanced_confidence(self, demographics: Dict, behavioral_focus: List[str], 
                                      psychographics: Dict) -> float:
@@ -386,6 +569,16 @@ class AudienceFilteringAgent:
     
     def __init__(self, users_data: pd.DataFrame):
         self.users_data = users_data
+        
+        # Raw NumPy views of the filter columns so predicates skip Series overhead
+        self._values = {col: users_data[col].to_numpy() for col in users_data.select_dtypes("number").columns}
+        self._categories = {col: users_data[col].cat for col in users_data.select_dtypes("category").columns}
+        
+        # Spend thresholds are fixed for the table, so compute them once
+        self._q = {
+            "grocery_spend_q30": _partition_quantile(users_data["grocery_spend"].to_numpy(), 0.3),
+            "beauty_spend_q70": _partition_quantile(users_data["beauty_spend"].to_numpy(), 0.7)
+        }
     
     def filter_audience(self, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
         """Filter audience based on enhanced goal analysis with LLM-assisted SQL generation"""
@@ -452,48 +645,26 @@ SELECT * FROM users WHERE age >= 26 AND age <= 40 AND annual_hhi IN ('₹5L-₹1
     def _execute_llm_sql_query(self, sql_query: str, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
         """Execute LLM-generated SQL query (simulated with pandas)"""
         
-        # For demo purposes, we'll simulate SQL execution using pandas filtering
+        # For demo purposes, the SQL text is not executed: the rule-based
+        # filters for the same goal analysis stand in for it.
         # In production, you'd connect to a real database and execute the SQL
-        
-        filtered_data = self.users_data.copy()
-        
-        # Parse basic SQL conditions (simplified parser for demo)
-        if 'WHERE' in sql_query.upper():
-            where_clause = sql_query.split('WHERE')[1].strip()
-            
-            # Apply filters based on goal analysis (simulating SQL execution)
-            filtered_data = self._apply_demographic_filters(filtered_data, goal_analysis.target_demographics)
-            filtered_data = self._apply_behavioral_filters(filtered_data, goal_analysis.behavioral_focus)
-            filtered_data = self._apply_psychographic_filters(filtered_data, goal_analysis.psychographic_profile)
-            filtered_data = self._apply_commerce_filters(filtered_data, goal_analysis.commerce_patterns)
-        
-        return filtered_data
+        return self.users_data[self._build_filter_mask(goal_analysis)]
     
     def _filter_audience_rules(self, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
         """Fallback rule-based audience filtering"""
         
-        filtered_data = self.users_data.copy()
-        
-        # Apply demographic filters
-        filtered_data = self._apply_demographic_filters(filtered_data, goal_analysis.target_demographics)
-        
-        # Apply behavioral filters
-        filtered_data = self._apply_behavioral_filters(filtered_data, goal_analysis.behavioral_focus)
-        
-        # Apply psychographic filters
-        filtered_data = self._apply_psychographic_filters(filtered_data, goal_analysis.psychographic_profile)
-        
-        # Apply commerce filters
-        filtered_data = self._apply_commerce_filters(filtered_data, goal_analysis.commerce_patterns)
+        # Apply demographic, behavioral, psychographic and commerce filters in one pass
+        filtered_data = self.users_data[self._build_filter_mask(goal_analysis)]
         
         # Sample if too large
         if len(filtered_data) > 2000:
-            filtered_data = filtered_data.sample(n=2000, random_state=42)
+            rng = np.random.default_rng(42)
+            filtered_data = filtered_data.iloc[rng.choice(len(filtered_data), size=2000, replace=False)]
         
         # Fallback if empty after strict filters: relax and select a reasonable cohort
         if len(filtered_data) == 0:
             # Prefer high propensity to buy if available, else use digital engagement
-            df = self.users_data.copy()
+            df = self.users_data
             if "propensity_to_buy" in df.columns:
                 filtered_data = df.sort_values("propensity_to_buy", ascending=False).head(1000)
             elif "tech_adoption_score" in df.columns:
@@ -503,96 +674,116 @@ SELECT * FROM users WHERE age >= 26 AND age <= 40 AND annual_hhi IN ('₹5L-₹1
         
         return filtered_data
     
-    def _apply_demographic_filters(self, data: pd.DataFrame, demographics: Dict[str, Any]) -> pd.DataFrame:
-        """Apply demographic filters"""
+    def _build_filter_mask(self, goal_analysis: EnhancedGoalAnalysis) -> np.ndarray:
+        """AND every goal predicate into a single boolean mask over users_data"""
+        masks = [np.ones(len(self.users_data), dtype=bool)]
+        masks += self._demographic_masks(goal_analysis.target_demographics)
+        masks += self._behavioral_masks(goal_analysis.behavioral_focus)
+        masks += self._psychographic_masks(goal_analysis.psychographic_profile)
+        masks += self._commerce_masks(goal_analysis.commerce_patterns)
+        return np.logical_and.reduce(masks)
+    
+    def _isin(self, column: str, labels: List[str]) -> np.ndarray:
+        """Membership mask on a categorical column, compared via its integer codes"""
+        categories = self._categories[column]
+        codes = [categories.categories.get_loc(label) for label in labels if label in categories.categories]
+        return np.isin(categories.codes.to_numpy(), codes)
+    
+    def _demographic_masks(self, demographics: Dict[str, Any]) -> List[np.ndarray]:
+        """Demographic filter masks"""
+        values = self._values
+        masks = []
         
         if "age_group" in demographics:
             age_group = demographics["age_group"]
             if age_group == "gen_z":
-                data = data[data["age"].between(18, 25)]
+                masks.append((values["age"] >= 18) & (values["age"] <= 25))
             elif age_group == "millennial":
-                data = data[data["age"].between(26, 40)]
+                masks.append((values["age"] >= 26) & (values["age"] <= 40))
             elif age_group == "gen_x":
-                data = data[data["age"].between(41, 55)]
+                masks.append((values["age"] >= 41) & (values["age"] <= 55))
             elif age_group == "boomer":
-                data = data[data["age"] >= 56]
+                masks.append(values["age"] >= 56)
         
         if "income_level" in demographics:
             income_level = demographics["income_level"]
             if income_level == "high_income":
-                data = data[data["annual_hhi"].isin(["₹10L-₹20L", "₹20L-₹50L", "₹50L+"])]
+                masks.append(self._isin("annual_hhi", ["₹10L-₹20L", "₹20L-₹50L", "₹50L+"]))
             elif income_level == "middle_income":
-                data = data[data["annual_hhi"].isin(["₹2L-₹5L", "₹5L-₹10L"])]
+                masks.append(self._isin("annual_hhi", ["₹2L-₹5L", "₹5L-₹10L"]))
             elif income_level == "low_income":
-                data = data[data["annual_hhi"] == "Under ₹2L"]
+                masks.append(self._isin("annual_hhi", ["Under ₹2L"]))
         
         if "education_level" in demographics:
             education_level = demographics["education_level"]
             if education_level == "high_education":
-                data = data[data["education_level"].isin(["Graduate", "Postgraduate", "Doctorate"])]
+                masks.append(self._isin("education_level", ["Graduate", "Postgraduate", "Doctorate"]))
             elif education_level == "medium_education":
-                data = data[data["education_level"] == "Secondary"]
+                masks.append(self._isin("education_level", ["Secondary"]))
             elif education_level == "basic_education":
-                data = data[data["education_level"] == "Primary"]
+                masks.append(self._isin("education_level", ["Primary"]))
         
-        return data
+        return masks
     
-    def _apply_behavioral_filters(self, data: pd.DataFrame, behavioral_focus: List[str]) -> pd.DataFrame:
-        """Apply behavioral filters"""
+    def _behavioral_masks(self, behavioral_focus: List[str]) -> List[np.ndarray]:
+        """Behavioral filter masks"""
+        values = self._values
+        masks = []
         
         if "shopping" in behavioral_focus:
-            data = data[data["grocery_spend"] > data["grocery_spend"].quantile(0.3)]
+            masks.append(values["grocery_spend"] > self._q["grocery_spend_q30"])
         
         if "media" in behavioral_focus:
-            data = data[data["social_media_usage"] > 0.5]
+            masks.append(values["social_media_usage"] > 0.5)
         
         if "travel" in behavioral_focus:
-            data = data[data["travel_frequency"].isin(["Occasionally", "Frequently"])]
+            masks.append(self._isin("travel_frequency", ["Occasionally", "Frequently"]))
         
         if "health" in behavioral_focus:
-            data = data[data["fitness_interest"] > 0.5]
+            masks.append(values["fitness_interest"] > 0.5)
         
         if "finance" in behavioral_focus:
-            data = data[data["investment_interest"] > 0.5]
+            masks.append(values["investment_interest"] > 0.5)
         
         if "technology" in behavioral_focus:
-            data = data[data["tech_adoption_score"] > 0.6]
+            masks.append(values["tech_adoption_score"] > 0.6)
         
-        return data
+        return masks
     
-    def _apply_psychographic_filters(self, data: pd.DataFrame, psychographics: Dict[str, Any]) -> pd.DataFrame:
-        """Apply psychographic filters"""
+    def _psychographic_masks(self, psychographics: Dict[str, Any]) -> List[np.ndarray]:
+        """Psychographic filter masks"""
+        values = self._values
+        masks = []
         
         if "innovators" in psychographics:
-            data = data[data["innovation_preference"] > 0.6]
+            masks.append(values["innovation_preference"] > 0.6)
         
-        if "conservatives" in psychographics:
-            data = data[data["conscientiousness"] > 0.6]
+        if "conservatives" in psychographics or "achievers" in psychographics:
+            masks.append(values["conscientiousness"] > 0.6)
         
         if "socially_conscious" in psychographics:
-            data = data[data["environmental_consciousness"] > 0.6]
-        
-        if "achievers" in psychographics:
-            data = data[data["conscientiousness"] > 0.6]
+            masks.append(values["environmental_consciousness"] > 0.6)
         
         if "experiencers" in psychographics:
-            data = data[data["extraversion"] > 0.6]
+            masks.append(values["extraversion"] > 0.6)
         
-        return data
+        return masks
     
-    def _apply_commerce_filters(self, data: pd.DataFrame, commerce_patterns: List[str]) -> pd.DataFrame:
-        """Apply commerce pattern filters"""
+    def _commerce_masks(self, commerce_patterns: List[str]) -> List[np.ndarray]:
+        """Commerce pattern filter masks"""
+        values = self._values
+        masks = []
         
         if "frequent_shoppers" in commerce_patterns:
-            data = data[data["grocery_frequency"].isin(["Daily", "Weekly"])]
+            masks.append(self._isin("grocery_frequency", ["Daily", "Weekly"]))
         
         if "premium_buyers" in commerce_patterns:
-            data = data[data["beauty_spend"] > data["beauty_spend"].quantile(0.7)]
+            masks.append(values["beauty_spend"] > self._q["beauty_spend_q70"])
         
         if "online_shoppers" in commerce_patterns:
-            data = data[data["tech_adoption_score"] > 0.6]
+            masks.append(values["tech_adoption_score"] > 0.6)
         
-        return data
+        return masks
 
 class EnhancedFeatureEngineerAgent:
     """Agent 3: Enhanced feature engineering"""
@@ -600,7 +791,17 @@ class EnhancedFeatureEngineerAgent:
     def engineer_enhanced_features(self, data: pd.DataFrame, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
         """Engineer enhanced features with LLM-assisted feature selection"""
         
-        df = data.copy()
+        # Copy-on-write is scoped to this agent rather than set process-wide: it lets the
+        # shallow copy below share the caller's column buffers while any write copies them.
+        # The returned frame still shares untouched raw columns with `data`.
+        with pd.option_context("mode.copy_on_write", True):
+            return self._engineer_enhanced_features(data, goal_analysis)
+    
+    def _engineer_enhanced_features(self, data: pd.DataFrame, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
+        """Feature engineering body, run under copy-on-write"""
+        
+        # Shallow copy so new columns don't leak into the caller's frame
+        df = data.copy(deep=False)
         
         # Try LLM-assisted feature engineering first
         if is_llm_enabled():
@@ -609,6 +810,7 @@ class EnhancedFeatureEngineerAgent:
                 df = self._apply_llm_feature_engineering(df, llm_features, goal_analysis)
         
         # Always apply core feature engineering
+        df = _ensure_numeric(df, OPTIONAL_NUMERIC_COLUMNS)
         df = self._create_composite_features(df)
         df = self._create_behavioral_scores(df, goal_analysis)
         df = self._create_psychographic_profiles(df)
@@ -661,11 +863,7 @@ Return JSON format:
         if not llm_response:
             return None
         
-        try:
-            import json
-            return json.loads(llm_response.strip())
-        except json.JSONDecodeError:
-            return None
+        return _parse_llm_json(llm_response)
     
     def _apply_llm_feature_engineering(self, df: pd.DataFrame, llm_features: Dict, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
         """Apply LLM-recommended feature engineering"""
@@ -676,8 +874,8 @@ Return JSON format:
                 try:
                     name = comp_feature["name"]
                     formula = comp_feature["formula"]
-                    # Simple formula evaluation (in production, use safer methods)
-                    df[name] = eval(formula.replace("feature1", "df['feature1']").replace("feature2", "df['feature2']"))
+                    if _is_safe_formula(formula, df.columns):
+                        df[name] = df.eval(formula)
                 except:
                     pass  # Skip invalid formulas
         
@@ -699,27 +897,28 @@ Return JSON format:
     def _create_composite_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create composite features"""
         
-        # Spending power
-        df["spending_power"] = (
-            df["grocery_spend"] * 0.3 +
-            df["beauty_spend"] * 0.2 +
-            df["household_spend"] * 0.3 +
-            df["health_spend"] * 0.2 +
-            (df["avg_order_value"] / max(1.0, float(df["avg_order_value"].max()))) * 0.2
-        )
-        
-        # Digital engagement
+        scores = _weighted_sums(df, {
+            # Spending power
+            "spending_power": {
+                "grocery_spend": 0.3, "beauty_spend": 0.2, "household_spend": 0.3, "health_spend": 0.2,
+                "avg_order_value": 0.2 / max(1.0, float(df["avg_order_value"].max()))
+            },
+            # Digital engagement (numeric part; platform flags averaged into 0.1)
+            "digital_engagement": {
+                "social_media_usage": 0.4, "tech_adoption_score": 0.3,
+                "fb_usage": 0.025, "ig_usage": 0.025, "yt_usage": 0.025, "tt_usage": 0.025
+            }
+        })
+        df["spending_power"] = scores["spending_power"]
         df["digital_engagement"] = (
-            df["social_media_usage"] * 0.4 +
-            df["tech_adoption_score"] * 0.3 +
-            df["streaming_services"].apply(lambda x: 1 if x != "None" else 0) * 0.2 +
-            (df.get("fb_usage", 0) + df.get("ig_usage", 0) + df.get("yt_usage", 0) + df.get("tt_usage", 0)) / 4 * 0.1
+            scores["digital_engagement"] +
+            df["streaming_services"].ne("None").to_numpy(dtype=np.float32) * 0.2
         )
         
         # Lifestyle complexity
         df["lifestyle_complexity"] = (
-            df["travel_frequency"].apply(lambda x: {"Never": 0, "Rarely": 1, "Occasionally": 2, "Frequently": 3}[x]) * 0.3 +
-            df["fitness_frequency"].apply(lambda x: {"Never": 0, "Rarely": 1, "Weekly": 2, "Daily": 3}[x]) * 0.3 +
+            df["travel_frequency"].map(_TRAVEL_MAP).astype(np.float32) * 0.3 +
+            df["fitness_frequency"].map(_FITNESS_MAP).astype(np.float32) * 0.3 +
             df["investment_interest"] * 0.4
         )
         
@@ -728,58 +927,47 @@ Return JSON format:
     def _create_behavioral_scores(self, df: pd.DataFrame, goal_analysis: EnhancedGoalAnalysis) -> pd.DataFrame:
         """Create behavioral scores"""
         
-        # Shopping behavior score
-        df["shopping_behavior_score"] = (
-            df["grocery_spend"] / df["grocery_spend"].max() * 0.3 +
-            df["beauty_spend"] / df["beauty_spend"].max() * 0.2 +
-            df["electronics_interest"] * 0.3 +
-            df["auto_interest"] * 0.2 +
-            (df.get("shopping_app_use", 0) * 0.2) +
-            (1 - df.get("cart_abandon_rate", 0)) * 0.2 +
-            (df.get("propensity_to_buy", 0) * 0.4)
-        )
-        
-        # Media consumption score
-        df["media_consumption_score"] = (
-            df["social_media_usage"] * 0.3 +
-            df["entertainment_interest"] * 0.2 +
-            df["news_interest"] * 0.2 +
-            df["technology_interest"] * 0.2 +
-            (df.get("email_open_rate", 0) * 0.05 + df.get("email_click_rate", 0) * 0.05)
-        )
+        # Each spend column is scanned for its max once and folded into the weights
+        grocery_max = df["grocery_spend"].max()
+        beauty_max = df["beauty_spend"].max()
         
-        # Health consciousness score
-        df["health_consciousness_score"] = (
-            df["fitness_interest"] * 0.4 +
-            df["health_product_interest"] * 0.3 +
-            df["health_interest"] * 0.3
-        )
+        scores = _weighted_sums(df, {
+            # Shopping behavior score; (1 - cart_abandon_rate) * 0.2 is a -0.2 weight plus a 0.2 offset
+            "shopping_behavior_score": {
+                "grocery_spend": 0.3 / grocery_max, "beauty_spend": 0.2 / beauty_max,
+                "electronics_interest": 0.3, "auto_interest": 0.2, "shopping_app_use": 0.2,
+                "cart_abandon_rate": -0.2, "propensity_to_buy": 0.4
+            },
+            # Media consumption score
+            "media_consumption_score": {
+                "social_media_usage": 0.3, "entertainment_interest": 0.2, "news_interest": 0.2,
+                "technology_interest": 0.2, "email_open_rate": 0.05, "email_click_rate": 0.05
+            },
+            # Health consciousness score
+            "health_consciousness_score": {
+                "fitness_interest": 0.4, "health_product_interest": 0.3, "health_interest": 0.3
+            }
+        })
+        scores["shopping_behavior_score"] += 0.2
+        df[list(scores.columns)] = scores
         
         return df
     
     def _create_psychographic_profiles(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create psychographic profiles"""
         
-        # Innovation profile
-        df["innovation_profile"] = (
-            df["innovation_preference"] * 0.4 +
-            df["tech_adoption_score"] * 0.3 +
-            df["openness"] * 0.3
-        )
-        
-        # Social responsibility profile
-        df["social_responsibility_profile"] = (
-            df["social_responsibility"] * 0.4 +
-            df["environmental_consciousness"] * 0.3 +
-            df["agreeableness"] * 0.3
-        )
-        
-        # Achievement orientation
-        df["achievement_orientation"] = (
-            df["conscientiousness"] * 0.4 +
-            df["investment_interest"] * 0.3 +
-            df["extraversion"] * 0.3
-        )
+        scores = _weighted_sums(df, {
+            "innovation_profile": {
+                "innovation_preference": 0.4, "tech_adoption_score": 0.3, "openness": 0.3
+            },
+            "social_responsibility_profile": {
+                "social_responsibility": 0.4, "environmental_consciousness": 0.3, "agreeableness": 0.3
+            },
+            "achievement_orientation": {
+                "conscientiousness": 0.4, "investment_interest": 0.3, "extraversion": 0.3
+            }
+        })
+        df[list(scores.columns)] = scores
         
         return df
     
@@ -788,15 +976,15 @@ Return JSON format:
         
         # Family orientation
         df["family_orientation"] = (
-            df["num_children"].apply(lambda x: min(x, 4) / 4) * 0.4 +
-            df["marital_status"].apply(lambda x: 1 if x == "Married" else 0) * 0.3 +
+            np.minimum(df["num_children"].to_numpy(), 4) / 4.0 * 0.4 +
+            df["marital_status"].eq("Married").to_numpy(dtype=np.float32) * 0.3 +
             df["grocery_spend"] / df["grocery_spend"].max() * 0.3
         )
         
         # Urban sophistication
         df["urban_sophistication"] = (
-            df["city_tier"].apply(lambda x: {"Tier-1": 1, "Tier-2": 0.7, "Tier-3": 0.4, "Rural": 0.1}[x]) * 0.4 +
-            df["education_level"].apply(lambda x: {"Primary": 0.2, "Secondary": 0.4, "Graduate": 0.7, "Postgraduate": 0.9, "Doctorate": 1.0}[x]) * 0.3 +
+            df["city_tier"].map(_CITY_TIER_MAP).astype(np.float32) * 0.4 +
+            df["education_level"].map(_EDU_MAP).astype(np.float32) * 0.3 +
             df["tech_adoption_score"] * 0.3
         )
         
@@ -804,32 +992,41 @@ Return JSON format:
 
     def _create_engagement_loyalty_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create engagement and loyalty signals from expanded feature set"""
+        scores = _weighted_sums(df, {
+            # Coupon/referral part of the loyalty score
+            "loyalty_score": {"coupon_usage_rate": 0.25, "referral_tendency": 0.25},
+            # Brand affinity composite
+            "brand_affinity_score": {
+                "brand_bose_affinity": 0.2, "brand_apple_affinity": 0.2, "brand_samsung_affinity": 0.2,
+                "brand_nike_affinity": 0.2, "brand_amazon_affinity": 0.2
+            }
+        })
+        
         # Loyalty score from tier and coupon/referral behavior
-        tier_weight = df.get("loyalty_tier", "None").map({"None": 0.0, "Bronze": 0.25, "Silver": 0.5, "Gold": 0.75, "Platinum": 1.0}) if "loyalty_tier" in df else 0
+        tier_weight = df.get("loyalty_tier", "None").map(_LOYALTY_TIER_MAP).astype(np.float32) if "loyalty_tier" in df else 0
         df["loyalty_score"] = (
             (tier_weight if isinstance(tier_weight, pd.Series) else 0) * 0.5 +
-            df.get("coupon_usage_rate", 0) * 0.25 +
-            df.get("referral_tendency", 0) * 0.25
-        )
-        
-        # Brand affinity composite
-        df["brand_affinity_score"] = (
-            df.get("brand_bose_affinity", 0) * 0.2 +
-            df.get("brand_apple_affinity", 0) * 0.2 +
-            df.get("brand_samsung_affinity", 0) * 0.2 +
-            df.get("brand_nike_affinity", 0) * 0.2 +
-            df.get("brand_amazon_affinity", 0) * 0.2
+            scores["loyalty_score"]
         )
+        df["brand_affinity_score"] = scores["brand_affinity_score"]
         
         # Risk and opportunity indices
         df["retention_risk_index"] = (
-            df.get("churn_risk", 0) * 0.6 + (1 - df.get("loyalty_score", 0)) * 0.4
+            df["churn_risk"] * 0.6 + (1 - df["loyalty_score"]) * 0.4
         )
         df["conversion_opportunity_index"] = (
-            df.get("propensity_to_buy", 0) * 0.6 + df.get("digital_engagement", 0) * 0.4
+            df["propensity_to_buy"] * 0.6 + df["digital_engagement"] * 0.4
         )
         return df
 
+# Clustering estimators the LLM may recommend, built for a given k
+_ALGO_CTORS = {
+    "kmeans": lambda k: KMeans(n_clusters=k, random_state=42, n_init="auto"),
+    "hdbscan": lambda k: HDBSCAN(min_cluster_size=max(10, k), min_samples=5),
+    "dbscan": lambda k: DBSCAN(eps=0.5, min_samples=5),
+    "gaussian_mixture": lambda k: GaussianMixture(n_components=k, random_state=42),
+}
+
 class EnhancedClusteringAgent:
     """Agent 4: Enhanced clustering with comprehensive features"""
     
@@ -838,10 +1035,11 @@ class EnhancedClusteringAgent:
         
         # Select features for clustering
         feature_columns = self._select_enhanced_features(data, goal_analysis)
-        X = data[feature_columns].values
+        # Own the buffer: without it to_numpy can return a read-only view of a single float32 block
+        X = data[feature_columns].to_numpy(dtype=np.float32, copy=True)
         
-        # Scale features
-        scaler = StandardScaler()
+        # Scale features in place; float32 is kept through scaling and clustering
+        scaler = StandardScaler(copy=False)
         X_scaled = scaler.fit_transform(X)
         
         # Try LLM-assisted clustering parameter selection
@@ -916,48 +1114,21 @@ Available algorithms: kmeans, hdbscan, dbscan, gaussian_mixture
         if not llm_response:
             return None
         
-        try:
-            import json
-            return json.loads(llm_response.strip())
-        except json.JSONDecodeError:
-            return None
+        return _parse_llm_json(llm_response)
     
     def _apply_llm_clustering_algorithm(self, X_scaled: np.ndarray, optimal_k: int, clustering_params: Dict) -> np.ndarray:
         """Apply LLM-recommended clustering algorithm"""
         
         algorithm = clustering_params.get("algorithm", "kmeans")
         
-        if algorithm == "kmeans":
-            kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init="auto")
-            return kmeans.fit_predict(X_scaled)
-        
-        elif algorithm == "hdbscan":
-            from sklearn.cluster import HDBSCAN
-            hdbscan = HDBSCAN(min_cluster_size=max(10, optimal_k), min_samples=5)
-            labels = hdbscan.fit_predict(X_scaled)
-            # Convert HDBSCAN labels to 0-based cluster IDs
-            unique_labels = np.unique(labels)
-            label_map = {label: i for i, label in enumerate(unique_labels)}
-            return np.array([label_map[label] for label in labels])
-        
-        elif algorithm == "dbscan":
-            from sklearn.cluster import DBSCAN
-            dbscan = DBSCAN(eps=0.5, min_samples=5)
-            labels = dbscan.fit_predict(X_scaled)
-            # Convert DBSCAN labels to 0-based cluster IDs
-            unique_labels = np.unique(labels)
-            label_map = {label: i for i, label in enumerate(unique_labels)}
-            return np.array([label_map[label] for label in labels])
-        
-        elif algorithm == "gaussian_mixture":
-            from sklearn.mixture import GaussianMixture
-            gmm = GaussianMixture(n_components=optimal_k, random_state=42)
-            return gmm.fit_predict(X_scaled)
+        # Unknown algorithms fall back to KMeans
+        labels = _ALGO_CTORS.get(algorithm, _ALGO_CTORS["kmeans"])(optimal_k).fit_predict(X_scaled)
         
-        else:
-            # Fallback to KMeans
-            kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init="auto")
-            return kmeans.fit_predict(X_scaled)
+        if algorithm in ("hdbscan", "dbscan"):
+            # Convert density-based labels (noise = -1) to 0-based cluster IDs
+            _, labels = np.unique(labels, return_inverse=True)
+            return labels.astype(np.int32)
+        return labels
     
     def _select_enhanced_features(self, data: pd.DataFrame, goal_analysis: EnhancedGoalAnalysis) -> List[str]:
         """Select enhanced features for clustering"""
@@ -1000,10 +1171,13 @@ Available algorithms: kmeans, hdbscan, dbscan, gaussian_mixture
         best_k = 2
         best_score = -1
         
+        # Mini-batch fits and a capped silhouette sample keep the sweep cheap;
+        # the chosen k is refit with full KMeans by the caller
+        sample_size = min(5000, len(X))
         for k in range(k_min, k_max + 1):
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init="auto")
+            kmeans = MiniBatchKMeans(n_clusters=k, random_state=42, batch_size=4096, n_init=3)
             labels = kmeans.fit_predict(X)
-            score = silhouette_score(X, labels)
+            score = silhouette_score(X, labels, sample_size=sample_size, random_state=42)
             
             if score > best_score:
                 best_score = score
@@ -1013,27 +1187,53 @@ Available algorithms: kmeans, hdbscan, dbscan, gaussian_mixture
     
     def _calculate_enhanced_cluster_stats(self, data: pd.DataFrame, feature_columns: List[str]) -> Dict[int, Dict]:
         """Calculate enhanced cluster statistics"""
-        cluster_stats = {}
+        grouped = data.groupby("cluster_id", sort=False)
+        
+        # All sizes and means in one grouped pass
+        numeric = grouped.agg(
+            size=("cluster_id", "size"),
+            avg_age=("age", "mean"),
+            avg_spending_power=("spending_power", "mean"),
+            avg_digital_engagement=("digital_engagement", "mean"),
+            avg_lifestyle_complexity=("lifestyle_complexity", "mean")
+        ).to_dict(orient="index")
+        dominant = grouped[["gender", "annual_hhi", "education_level"]].agg(
+            lambda s: s.mode().iat[0] if not s.mode().empty else "Unknown"
+        ).to_dict(orient="index")
         
-        for cluster_id in data["cluster_id"].unique():
-            cluster_data = data[data["cluster_id"] == cluster_id]
-            
-            stats = {
-                "size": len(cluster_data),
-                "size_pct": len(cluster_data) / len(data) * 100,
-                "avg_age": cluster_data["age"].mean(),
-                "dominant_gender": cluster_data["gender"].mode().iloc[0] if not cluster_data["gender"].mode().empty else "Unknown",
-                "dominant_income": cluster_data["annual_hhi"].mode().iloc[0] if not cluster_data["annual_hhi"].mode().empty else "Unknown",
-                "dominant_education": cluster_data["education_level"].mode().iloc[0] if not cluster_data["education_level"].mode().empty else "Unknown",
-                "avg_spending_power": cluster_data["spending_power"].mean(),
-                "avg_digital_engagement": cluster_data["digital_engagement"].mean(),
-                "avg_lifestyle_complexity": cluster_data["lifestyle_complexity"].mean()
+        cluster_stats = {}
+        for cluster_id, row in numeric.items():
+            cluster_stats[cluster_id] = {
+                "size": row["size"],
+                "size_pct": row["size"] / len(data) * 100,
+                "avg_age": row["avg_age"],
+                "dominant_gender": dominant[cluster_id]["gender"],
+                "dominant_income": dominant[cluster_id]["annual_hhi"],
+                "dominant_education": dominant[cluster_id]["education_level"],
+                "avg_spending_power": row["avg_spending_power"],
+                "avg_digital_engagement": row["avg_digital_engagement"],
+                "avg_lifestyle_complexity": row["avg_lifestyle_complexity"]
             }
-            
-            cluster_stats[cluster_id] = stats
         
         return cluster_stats
 
+# Rule-based label parts per intent: ordered (compare, stat, threshold, trait, noun) rules
+# and the (trait, noun) used when none match; unknown intents label like "reach"
+_RULE_LABEL_PARTS = {
+    "conversion": ([(np.greater, "avg_spending_power", 0.7, "High-Value", "Shoppers"),
+                    (np.greater, "avg_digital_engagement", 0.7, "Digital-First", "Buyers")],
+                   ("Traditional", "Consumers")),
+    "engagement": ([(np.greater, "avg_digital_engagement", 0.7, "Highly Engaged", "Users"),
+                    (np.greater, "avg_lifestyle_complexity", 0.7, "Active Lifestyle", "Users")],
+                   ("Moderate", "Engagers")),
+    "retention": ([(np.greater, "avg_lifestyle_complexity", 0.7, "Complex Lifestyle", "Users"),
+                   (np.greater, "avg_spending_power", 0.7, "Premium", "Customers")],
+                  ("Standard", "Users")),
+    "reach": ([(np.less, "avg_age", 30, "Young", "Audience"),
+               (np.greater, "avg_age", 50, "Mature", "Audience")],
+              ("Mid-Age", "Audience")),
+}
+
 class EnhancedPersonaLabelingAgent:
     """Agent 5: Enhanced persona labeling"""
     
@@ -1044,24 +1244,38 @@ class EnhancedPersonaLabelingAgent:
         cluster_stats = clusters["cluster_stats"]
         intent = goal_analysis.intent
         
-        cluster_labels = {}
+        llm_on = is_llm_enabled()
         
-        for cluster_id, stats in cluster_stats.items():
-            label = self._generate_enhanced_cluster_label(cluster_id, stats, intent)
-            cluster_labels[cluster_id] = label
+        # Without the LLM every label is rule-based, so build them in one vectorized pass
+        if not llm_on:
+            labeled_clusters["cluster_labels"] = self._generate_rule_based_labels(cluster_stats, intent)
+            return labeled_clusters
         
-        labeled_clusters["cluster_labels"] = cluster_labels
+        def label_for(item):
+            cluster_id, stats = item
+            return self._generate_enhanced_cluster_label(cluster_id, stats, intent, llm_on)
+        
+        # LLM calls are I/O-bound and independent per cluster, so overlap them
+        items = list(cluster_stats.items())
+        if len(items) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+                labels = list(executor.map(label_for, items))
+        else:
+            labels = [label_for(item) for item in items]
+        
+        labeled_clusters["cluster_labels"] = dict(zip(cluster_stats, labels))
         
         return labeled_clusters
     
-    def _generate_enhanced_cluster_label(self, cluster_id: int, stats: Dict[str, Any], intent: str) -> str:
+    def _generate_enhanced_cluster_label(self, cluster_id: int, stats: Dict[str, Any], intent: str,
+                                         llm_on: bool) -> str:
         """Generate enhanced cluster label with LLM assistance"""
         
         # Prepare cluster characteristics for LLM
         cluster_summary = self._prepare_cluster_summary(stats, intent)
         
         # Try LLM-assisted labeling first
-        if is_llm_enabled():
+        if llm_on:
             llm_label = self._generate_llm_cluster_label(cluster_summary, intent)
             if llm_label:
                 return llm_label.strip()[:120]
@@ -1123,48 +1337,81 @@ Label:"""
     
     def _generate_rule_based_label(self, stats: Dict[str, Any], intent: str) -> str:
         """Fallback rule-based labeling"""
+        return self._generate_rule_based_labels({0: stats}, intent)[0]
+    
+    def _generate_rule_based_labels(self, cluster_stats: Dict[int, Dict[str, Any]], intent: str) -> Dict[int, str]:
+        """Rule-based labels for all clusters at once"""
+        rules, (default_trait, default_noun) = _RULE_LABEL_PARTS.get(intent, _RULE_LABEL_PARTS["reach"])
+        cluster_ids = list(cluster_stats)
+        
+        # First matching rule wins, as in the per-cluster if/elif chain
+        conditions = [
+            compare(np.array([cluster_stats[c][stat] for c in cluster_ids], dtype=float), threshold)
+            for compare, stat, threshold, _, _ in rules
+        ]
+        traits = np.select(conditions, [trait for *_, trait, _ in rules], default=default_trait)
+        nouns = np.select(conditions, [noun for *_, noun in rules], default=default_noun)
         
-        age = stats["avg_age"]
-        spending_power = stats["avg_spending_power"]
-        digital_engagement = stats["avg_digital_engagement"]
-        lifestyle_complexity = stats["avg_lifestyle_complexity"]
-        gender = stats["dominant_gender"]
-        income = stats["dominant_income"]
-        
-        # Intent-specific labeling
-        if intent == "conversion":
-            if spending_power > 0.7:
-                label = f"High-Value {gender} Shoppers • {income}"
-            elif digital_engagement > 0.7:
-                label = f"Digital-First {gender} Buyers • {income}"
-            else:
-                label = f"Traditional {gender} Consumers • {income}"
-        
-        elif intent == "engagement":
-            if digital_engagement > 0.7:
-                label = f"Highly Engaged {gender} Users • {income}"
-            elif lifestyle_complexity > 0.7:
-                label = f"Active Lifestyle {gender} Users • {income}"
-            else:
-                label = f"Moderate {gender} Engagers • {income}"
-        
-        elif intent == "retention":
-            if lifestyle_complexity > 0.7:
-                label = f"Complex Lifestyle {gender} Users • {income}"
-            elif spending_power > 0.7:
-                label = f"Premium {gender} Customers • {income}"
-            else:
-                label = f"Standard {gender} Users • {income}"
-        
-        else:  # reach
-            if age < 30:
-                label = f"Young {gender} Audience • {income}"
-            elif age > 50:
-                label = f"Mature {gender} Audience • {income}"
-            else:
-                label = f"Mid-Age {gender} Audience • {income}"
-        
-        return label
+        return {
+            c: f"{trait} {cluster_stats[c]['dominant_gender']} {noun} • {cluster_stats[c]['dominant_income']}"
+            for c, trait, noun in zip(cluster_ids, traits, nouns)
+        }
+
+# Static tactic and focus lists shared by every strategy of an intent
+_CONVERSION_TACTICS = (
+    "Retargeting campaigns for high-intent users",
+    "Dynamic product ads based on behavior",
+    "Personalized messaging and offers",
+    "Conversion-optimized landing pages",
+    "Cross-selling and upselling strategies",
+)
+_CONVERSION_FOCUS = ("Purchase funnel optimization", "Cart abandonment recovery", "Product recommendations")
+_ENGAGEMENT_TACTICS = (
+    "Interactive content campaigns",
+    "Social media engagement programs",
+    "User-generated content initiatives",
+    "Community building activities",
+    "Gamification elements",
+)
+_ENGAGEMENT_FOCUS = ("Social media presence", "Content marketing", "Community engagement")
+_RETENTION_TACTICS = (
+    "Loyalty program development",
+    "Personalized retention campaigns",
+    "Customer feedback and improvement",
+    "Exclusive offers for existing customers",
+    "Long-term relationship building",
+)
+_RETENTION_FOCUS = ("Customer lifetime value", "Repeat purchase behavior", "Brand loyalty")
+_REACH_TACTICS = (
+    "Broad targeting across multiple platforms",
+    "High-frequency ad placements",
+    "Video content for maximum engagement",
+    "Cross-platform campaign coordination",
+    "Brand awareness campaigns",
+)
+_REACH_FOCUS = ("Brand visibility", "Market penetration", "Awareness building")
+
+# Channel tiers by digital engagement: high (> 0.7), medium (> 0.4), low
+_CHANNEL_TIERS = (
+    ("Instagram", "TikTok", "YouTube", "Facebook", "Google Display"),
+    ("Facebook", "Instagram", "Google Search", "YouTube"),
+    ("Google Search", "Facebook", "Traditional Media"),
+)
+
+_TIMELINES = {
+    "conversion": "2-4 weeks (short-term)",
+    "engagement": "4-8 weeks (medium-term)",
+    "retention": "8-12 weeks (long-term)",
+}
+_DEFAULT_TIMELINE = "6-10 weeks (medium-term)"
+
+_SUCCESS_METRICS = {
+    "reach": ("Impressions", "Reach", "Frequency", "Brand Awareness"),
+    "engagement": ("Engagement Rate", "Click-through Rate", "Time on Site", "Social Shares"),
+    "conversion": ("Conversions", "ROAS", "CPA", "Revenue"),
+    "retention": ("Retention Rate", "Customer Lifetime Value", "Repeat Purchase Rate", "Churn Rate"),
+}
+_DEFAULT_SUCCESS_METRICS = ("Impressions", "Engagement Rate", "Conversions")
 
 class EnhancedStrategyGeneratorAgent:
     """Agent 6: Enhanced strategy generation"""
@@ -1173,169 +1420,138 @@ class EnhancedStrategyGeneratorAgent:
                                    goal_analysis: EnhancedGoalAnalysis) -> List[Dict[str, Any]]:
         """Generate enhanced strategies"""
         
-        strategies = []
         cluster_stats = labeled_clusters["cluster_stats"]
         cluster_labels = labeled_clusters["cluster_labels"]
-        
-        for cluster_id in cluster_stats.keys():
-            strategy = self._generate_enhanced_strategy(
-                cluster_id, cluster_stats[cluster_id], 
-                cluster_labels[cluster_id], goal_analysis
-            )
-            strategies.append(strategy)
-        
-        return strategies
-    
-    def _generate_enhanced_strategy(self, cluster_id: int, stats: Dict[str, Any], 
-                                  label: str, goal_analysis: EnhancedGoalAnalysis) -> Dict[str, Any]:
-        """Generate enhanced strategy"""
+        cluster_ids = list(cluster_stats)
+        stats = [cluster_stats[c] for c in cluster_ids]
+        labels = [cluster_labels[c] for c in cluster_ids]
+        llm_on = is_llm_enabled()
         
         # Generate strategy based on intent and cluster characteristics
-        if goal_analysis.intent == "conversion":
-            strategy = self._generate_conversion_strategy(stats, label)
-        elif goal_analysis.intent == "engagement":
-            strategy = self._generate_engagement_strategy(stats, label)
-        elif goal_analysis.intent == "retention":
-            strategy = self._generate_retention_strategy(stats, label)
+        build_strategy = self._strategy_builder(goal_analysis.intent)
+        if not llm_on:
+            # Without LLM enrichment the strategy depends only on the intent, so build it once
+            # and give each cluster its own copy (tactics/focus are shared tuples)
+            base = build_strategy(stats[0], labels[0], llm_on) if stats else None
+            strategies = [dict(base) for _ in stats]
+        elif len(stats) > 1:
+            # LLM enrichment is I/O-bound and independent per cluster, so overlap it
+            with ThreadPoolExecutor(max_workers=min(8, len(stats))) as executor:
+                strategies = list(executor.map(build_strategy, stats, labels, [llm_on] * len(stats)))
         else:
-            strategy = self._generate_reach_strategy(stats, label)
-        
-        return {
-            "cluster_id": cluster_id,
-            "audience_label": label,
-            "strategy": strategy,
-            "budget_recommendation": self._calculate_enhanced_budget(stats),
-            "channel_recommendation": self._recommend_enhanced_channels(stats, goal_analysis),
-            "timeline": self._suggest_enhanced_timeline(stats, goal_analysis),
-            "success_metrics": self._define_success_metrics(goal_analysis.intent)
-        }
+            strategies = [build_strategy(s, label, llm_on) for s, label in zip(stats, labels)]
+        
+        # Budgets and channels come from one vectorized pass; timeline and metrics only depend on intent
+        budgets = self._calculate_enhanced_budgets(stats)
+        channels = self._recommend_enhanced_channels(stats)
+        timeline = self._suggest_enhanced_timeline(goal_analysis)
+        success_metrics = self._define_success_metrics(goal_analysis.intent)
+        
+        return [
+            {
+                "cluster_id": cluster_id,
+                "audience_label": label,
+                "strategy": strategy,
+                "budget_recommendation": budget,
+                "channel_recommendation": channel,
+                "timeline": timeline,
+                "success_metrics": success_metrics
+            }
+            for cluster_id, label, strategy, budget, channel
+            in zip(cluster_ids, labels, strategies, budgets, channels)
+        ]
+    
+    def _strategy_builder(self, intent: str):
+        """Strategy builder for an intent; anything unrecognised is treated as reach"""
+        if intent == "conversion":
+            return self._generate_conversion_strategy
+        elif intent == "engagement":
+            return self._generate_engagement_strategy
+        elif intent == "retention":
+            return self._generate_retention_strategy
+        return self._generate_reach_strategy
     
-    def _generate_conversion_strategy(self, stats: Dict[str, Any], label: str) -> Dict[str, Any]:
+    def _generate_conversion_strategy(self, stats: Dict[str, Any], label: str, llm_on: bool) -> Dict[str, Any]:
         """Generate conversion strategy"""
         base = {
             "objective": "Drive conversions and sales",
-            "tactics": [
-                "Retargeting campaigns for high-intent users",
-                "Dynamic product ads based on behavior",
-                "Personalized messaging and offers",
-                "Conversion-optimized landing pages",
-                "Cross-selling and upselling strategies"
-            ],
-            "focus_areas": ["Purchase funnel optimization", "Cart abandonment recovery", "Product recommendations"]
+            "tactics": _CONVERSION_TACTICS,
+            "focus_areas": _CONVERSION_FOCUS
         }
         # Optional LLM enrichment
-        if is_llm_enabled():
+        if llm_on:
             draft = generate_text(
                 f"Suggest 3 channel-specific tactics for the audience '{label}' focusing on conversion.")
             if draft:
                 base["llm_suggestions"] = draft
         return base
     
-    def _generate_engagement_strategy(self, stats: Dict[str, Any], label: str) -> Dict[str, Any]:
+    def _generate_engagement_strategy(self, stats: Dict[str, Any], label: str, llm_on: bool) -> Dict[str, Any]:
         """Generate engagement strategy"""
         base = {
             "objective": "Increase audience engagement and interaction",
-            "tactics": [
-                "Interactive content campaigns",
-                "Social media engagement programs",
-                "User-generated content initiatives",
-                "Community building activities",
-                "Gamification elements"
-            ],
-            "focus_areas": ["Social media presence", "Content marketing", "Community engagement"]
+            "tactics": _ENGAGEMENT_TACTICS,
+            "focus_areas": _ENGAGEMENT_FOCUS
         }
-        if is_llm_enabled():
+        if llm_on:
             draft = generate_text(
                 f"Suggest 3 engaging content ideas for '{label}' audience with hooks/calls-to-action.")
             if draft:
                 base["llm_suggestions"] = draft
         return base
     
-    def _generate_retention_strategy(self, stats: Dict[str, Any], label: str) -> Dict[str, Any]:
+    def _generate_retention_strategy(self, stats: Dict[str, Any], label: str, llm_on: bool) -> Dict[str, Any]:
         """Generate retention strategy"""
         base = {
             "objective": "Build customer loyalty and retention",
-            "tactics": [
-                "Loyalty program development",
-                "Personalized retention campaigns",
-                "Customer feedback and improvement",
-                "Exclusive offers for existing customers",
-                "Long-term relationship building"
-            ],
-            "focus_areas": ["Customer lifetime value", "Repeat purchase behavior", "Brand loyalty"]
+            "tactics": _RETENTION_TACTICS,
+            "focus_areas": _RETENTION_FOCUS
         }
-        if is_llm_enabled():
+        if llm_on:
             draft = generate_text(
                 f"Propose 3 retention campaign ideas for '{label}' audience with personalization angles.")
             if draft:
                 base["llm_suggestions"] = draft
         return base
     
-    def _generate_reach_strategy(self, stats: Dict[str, Any], label: str) -> Dict[str, Any]:
+    def _generate_reach_strategy(self, stats: Dict[str, Any], label: str, llm_on: bool) -> Dict[str, Any]:
         """Generate reach strategy"""
         base = {
             "objective": "Maximize audience reach and brand visibility",
-            "tactics": [
-                "Broad targeting across multiple platforms",
-                "High-frequency ad placements",
-                "Video content for maximum engagement",
-                "Cross-platform campaign coordination",
-                "Brand awareness campaigns"
-            ],
-            "focus_areas": ["Brand visibility", "Market penetration", "Awareness building"]
+            "tactics": _REACH_TACTICS,
+            "focus_areas": _REACH_FOCUS
         }
-        if is_llm_enabled():
+        if llm_on:
             draft = generate_text(
                 f"Suggest 3 high-reach channel tactics for '{label}' audience with creative angles.")
             if draft:
                 base["llm_suggestions"] = draft
         return base
     
-    def _calculate_enhanced_budget(self, stats: Dict[str, Any]) -> str:
-        """Calculate enhanced budget recommendation"""
-        spending_power = stats["avg_spending_power"]
-        size_pct = stats["size_pct"]
-        
-        if spending_power > 0.7 and size_pct > 20:
-            return "High Budget (₹100K-₹500K)"
-        elif spending_power > 0.5 and size_pct > 15:
-            return "Medium Budget (₹50K-₹100K)"
-        else:
-            return "Low Budget (₹10K-₹50K)"
+    def _calculate_enhanced_budgets(self, stats: List[Dict[str, Any]]) -> List[str]:
+        """Calculate enhanced budget recommendations for all clusters"""
+        spending_power = np.array([s["avg_spending_power"] for s in stats], dtype=float)
+        size_pct = np.array([s["size_pct"] for s in stats], dtype=float)
+        
+        return np.select(
+            [(spending_power > 0.7) & (size_pct > 20), (spending_power > 0.5) & (size_pct > 15)],
+            ["High Budget (₹100K-₹500K)", "Medium Budget (₹50K-₹100K)"],
+            default="Low Budget (₹10K-₹50K)"
+        ).tolist()
     
-    def _recommend_enhanced_channels(self, stats: Dict[str, Any], goal_analysis: EnhancedGoalAnalysis) -> List[str]:
-        """Recommend enhanced channels"""
-        digital_engagement = stats["avg_digital_engagement"]
-        
-        if digital_engagement > 0.7:
-            channels = ["Instagram", "TikTok", "YouTube", "Facebook", "Google Display"]
-        elif digital_engagement > 0.4:
-            channels = ["Facebook", "Instagram", "Google Search", "YouTube"]
-        else:
-            channels = ["Google Search", "Facebook", "Traditional Media"]
-        
-        return channels
+    def _recommend_enhanced_channels(self, stats: List[Dict[str, Any]]) -> List[Tuple[str, ...]]:
+        """Recommend enhanced channels for all clusters"""
+        digital_engagement = np.array([s["avg_digital_engagement"] for s in stats], dtype=float)
+        tiers = np.select([digital_engagement > 0.7, digital_engagement > 0.4], [0, 1], default=2)
+        return [_CHANNEL_TIERS[tier] for tier in tiers]
     
-    def _suggest_enhanced_timeline(self, stats: Dict[str, Any], goal_analysis: EnhancedGoalAnalysis) -> str:
+    def _suggest_enhanced_timeline(self, goal_analysis: EnhancedGoalAnalysis) -> str:
         """Suggest enhanced timeline"""
-        if goal_analysis.intent == "conversion":
-            return "2-4 weeks (short-term)"
-        elif goal_analysis.intent == "engagement":
-            return "4-8 weeks (medium-term)"
-        elif goal_analysis.intent == "retention":
-            return "8-12 weeks (long-term)"
-        else:
-            return "6-10 weeks (medium-term)"
+        return _TIMELINES.get(goal_analysis.intent, _DEFAULT_TIMELINE)
     
-    def _define_success_metrics(self, intent: str) -> List[str]:
+    def _define_success_metrics(self, intent: str) -> Tuple[str, ...]:
         """Define success metrics"""
-        metrics = {
-            "reach": ["Impressions", "Reach", "Frequency", "Brand Awareness"],
-            "engagement": ["Engagement Rate", "Click-through Rate", "Time on Site", "Social Shares"],
-            "conversion": ["Conversions", "ROAS", "CPA", "Revenue"],
-            "retention": ["Retention Rate", "Customer Lifetime Value", "Repeat Purchase Rate", "Churn Rate"]
-        }
-        return metrics.get(intent, ["Impressions", "Engagement Rate", "Conversions"])
+        return _SUCCESS_METRICS.get(intent, _DEFAULT_SUCCESS_METRICS)
 
 # Example usage
 if __name__ == "__main__":
@@ -7,9 +7,12 @@ Otherwise returns None and the caller should fallback.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 
+# The env gate is read once per process; call is_llm_enabled.cache_clear() after changing it
+@lru_cache(maxsize=1)
 def is_llm_enabled() -> bool:
     return os.getenv("ENABLE_LLM", "0") == "1" and bool(os.getenv("OPENAI_API_KEY"))
 
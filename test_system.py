@@ -4,9 +4,10 @@ Quick Test Script for Hybrid LLM+ML Multi-Agent System
 Run this to test the complete system locally
 """
 
-from enhanced_multi_agent import EnhancedMultiAgentSystem
+from enhanced_multi_agent import get_system
 from llm_agent import is_llm_enabled
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 def test_system():
     """Test the complete multi-agent system"""
@@ -26,7 +27,7 @@ def test_system():
     
     # Initialize system
     print("🔄 Initializing Multi-Agent System...")
-    system = EnhancedMultiAgentSystem()
+    system = get_system()
     print("✅ System initialized!")
     print()
     
@@ -121,14 +122,17 @@ def test_multiple_goals():
         "target tech professionals for B2B software"
     ]
     
-    system = EnhancedMultiAgentSystem()
-    
-    for i, goal in enumerate(test_goals, 1):
-        print(f"\n{i}. Goal: {goal}")
-        analysis = system.agents['enhanced_goal_analyzer'].analyze_enhanced_goal(goal)
-        print(f"   Intent: {analysis.intent} (confidence: {analysis.confidence:.2f})")
-        print(f"   Demographics: {analysis.target_demographics}")
-        print(f"   Behavioral Focus: {analysis.behavioral_focus}")
+    system = get_system()
+    
+    # Goals are analyzed concurrently; map() keeps results in input order
+    analyze = system.agents['enhanced_goal_analyzer'].analyze_enhanced_goal
+    with ThreadPoolExecutor(max_workers=len(test_goals)) as executor:
+        analyses = executor.map(analyze, test_goals)
+        for i, (goal, analysis) in enumerate(zip(test_goals, analyses), 1):
+            print(f"\n{i}. Goal: {goal}")
+            print(f"   Intent: {analysis.intent} (confidence: {analysis.confidence:.2f})")
+            print(f"   Demographics: {analysis.target_demographics}")
+            print(f"   Behavioral Focus: {analysis.behavioral_focus}")
 
 if __name__ == "__main__":
     test_system()